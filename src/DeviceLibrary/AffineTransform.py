@@ -0,0 +1,172 @@
+import math
+import klayout.db as db
+import numpy as np
+
+
+def identity() -> np.ndarray:
+    """The 3x3 identity transform."""
+    return np.eye(3)
+
+def translation(
+        dx: float,
+        dy: float,
+) -> np.ndarray:
+    """3x3 matrix of a translation by (dx, dy)."""
+    matrix = np.eye(3)
+    matrix[:2, 2] = dx, dy
+    return matrix
+
+def rotation(
+        angle: float,
+        center: tuple[float, float] = (0.0, 0.0),
+) -> np.ndarray:
+    """3x3 matrix of a counter-clockwise rotation by `angle` degrees about `center`.
+
+    Multiples of 90 degrees are exact, so rotated grid points stay on the grid.
+    """
+    quarter_turns, remainder = divmod(angle, 90)
+    if remainder == 0:
+        cos_angle, sin_angle = ((1, 0), (0, 1), (-1, 0), (0, -1))[int(quarter_turns) % 4]
+    else:
+        cos_angle, sin_angle = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+    matrix = np.array([[cos_angle, -sin_angle, 0], [sin_angle, cos_angle, 0], [0, 0, 1]], dtype=float)
+    return compose(translation(*center), matrix, translation(-center[0], -center[1]))
+
+def mirror(
+        axis: str = "x",
+        offset: float = 0.0,
+) -> np.ndarray:
+    """3x3 matrix of a reflection at a horizontal or vertical line.
+
+    Args:
+        axis: "x" reflects at the horizontal line y = offset (y -> 2 offset - y),
+            "y" at the vertical line x = offset (x -> 2 offset - x).
+        offset: Position of the mirror line.
+
+    Raises:
+        ValueError: If the axis is neither "x" nor "y".
+    """
+    if axis == "x":
+        return np.array([[1, 0, 0], [0, -1, 2 * offset], [0, 0, 1]], dtype=float)
+    if axis == "y":
+        return np.array([[-1, 0, 2 * offset], [0, 1, 0], [0, 0, 1]], dtype=float)
+    raise ValueError(f"Unknown mirror axis '{axis}', expected 'x' or 'y'.")
+
+def scaling(
+        factor: float,
+) -> np.ndarray:
+    """3x3 matrix of a uniform scaling about the origin."""
+    return np.diag([factor, factor, 1.0])
+
+def compose(
+        *matrices: np.ndarray,
+) -> np.ndarray:
+    """Compose transforms, the last one is applied first like in `A * B * p`.
+
+    Args:
+        matrices: 3x3 matrices, or stacks of shape (B, 3, 3) which are
+            broadcast against each other.
+
+    Returns:
+        The composed 3x3 matrix or (B, 3, 3) stack.
+    """
+    result = np.eye(3)
+    for matrix in matrices:
+        result = result @ np.asarray(matrix, dtype=float)
+    return result
+
+def apply_transform(
+        matrix: np.ndarray,
+        points,
+) -> np.ndarray:
+    """Apply a transform to an array of points or a batch of curves.
+
+    Args:
+        matrix: A 3x3 matrix, or a (B, 3, 3) stack with one transform per
+            curve of a batch.
+        points: An (N, 2) array, a list of (x, y) tuples, or a (B, N, 2)
+            batch of curves.
+
+    Returns:
+        The transformed points as a float array of the same shape.
+
+    Example:
+        .. code::
+
+            top_curve = apply_transform(mirror("x", offset=bottom_curve[-1, 1]), bottom_curve)
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    points = np.asarray(points, dtype=float)
+    linear = matrix[..., :2, :2]
+    shift = matrix[..., :2, 2]
+    if matrix.ndim == 3:
+        # One transform per curve of the batch
+        return np.einsum("bij,bnj->bni", linear, points) + shift[:, None, :]
+    return points @ linear.T + shift
+
+def from_klayout(
+        trans,
+) -> np.ndarray:
+    """3x3 matrix of a klayout transform.
+
+    Args:
+        trans: A db.DTrans, db.DCplxTrans, db.Trans or db.ICplxTrans. Integer
+            transforms are taken in database units.
+
+    Returns:
+        The equivalent 3x3 matrix.
+    """
+    if isinstance(trans, db.Trans):
+        trans = db.DTrans(trans)
+    if isinstance(trans, db.DTrans):
+        trans = db.DCplxTrans(trans)
+    elif isinstance(trans, db.ICplxTrans):
+        trans = db.DCplxTrans(trans.mag, trans.angle, trans.is_mirror(), trans.disp.x, trans.disp.y)
+
+    return compose(
+        translation(trans.disp.x, trans.disp.y),
+        scaling(trans.mag),
+        rotation(trans.angle),
+        mirror("x") if trans.is_mirror() else identity(),
+    )
+
+def to_klayout(
+        matrix: np.ndarray,
+        tolerance: float = 1e-9,
+) -> db.DCplxTrans:
+    """Convert a 3x3 matrix to the equivalent db.DCplxTrans.
+
+    klayout transforms are conformal: a uniform magnification, a rotation,
+    an optional mirror at the x axis (applied first) and a displacement.
+
+    Args:
+        matrix: The 3x3 matrix.
+        tolerance: Allowed deviation from a conformal transform.
+
+    Returns:
+        The db.DCplxTrans with the same effect as the matrix.
+
+    Raises:
+        ValueError: If the matrix is not conformal, e.g. shears, scales
+            non-uniformly or is not affine.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.shape != (3, 3) or not np.allclose(matrix[2], (0, 0, 1), atol=tolerance):
+        raise ValueError("Expected a 3x3 affine transform matrix.")
+
+    (a, b), (c, d) = matrix[:2, :2]
+    determinant = a * d - b * c
+    is_mirror = determinant < 0
+    if is_mirror:
+        # Remove the mirror at the x axis, which flips the sign of the second column
+        b, d = -b, -d
+    magnification = math.hypot(a, c)
+    if magnification <= tolerance or abs(a - d) > tolerance * magnification or abs(b + c) > tolerance * magnification:
+        raise ValueError("The matrix is not conformal and has no klayout transform equivalent.")
+
+    angle = math.degrees(math.atan2(c, a))
+    # Snap to exact multiples of 90 degrees, so they become simple klayout rotations
+    if abs(angle - round(angle / 90) * 90) < 1e-9:
+        angle = float(round(angle / 90) * 90 % 360)
+    return db.DCplxTrans(magnification, angle, bool(is_mirror), float(matrix[0, 2]), float(matrix[1, 2]))
@@ -4,6 +4,7 @@ import numpy as np
 from .BasicCurve import *
 from .BasicComponents import *
 from .Resonator import *
+from .CellParameters import *
 
 
 def all_pass_adiabatic_euler_ring(
@@ -60,6 +61,10 @@ def all_pass_adiabatic_euler_ring(
     """
     # Create a new cell for the all-pass ring resonator
     top_cell = canvas.create_cell("ALL_PASS_ADIABATIC_EULER_RING")
+    annotate_cell(top_cell, "all_pass_adiabatic_euler_ring", {
+        "waveguide_width": waveguide_width, "arc_length1": arc_length1, "arc_length2": arc_length2,
+        "straight_length": straight_length, "gap": gap,
+    })
 
     # Create the racetrack resonator
     racetrack = adiabatic_euler_racetrack_resonator(canvas=canvas, layer=layer,width=waveguide_width,straight_length=straight_length, num_points=2000, arc_length1=arc_length1, arc_length2=arc_length2)
@@ -72,7 +77,7 @@ def all_pass_adiabatic_euler_ring(
     L = np.sqrt(np.pi / alpha1)  # Constant ℓ
 
     # Compute Fresnel integrals to calculate X and Y coordinates
-    fresnel_sin, fresnel_cos = fresnel(1)
+    fresnel_sin, fresnel_cos = fresnel(1, backend="series")
     x_coords = L * fresnel_cos  # C(s/ℓ)
     # y_coords = L * fresnel_sin  # S(s/ℓ)
 
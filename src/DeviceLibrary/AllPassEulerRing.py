@@ -4,6 +4,7 @@ import numpy as np
 from .BasicCurve import *
 from .BasicComponents import *
 from .Resonator import *
+from .CellParameters import *
 
 
 def all_pass_euler_ring(
@@ -56,6 +57,9 @@ def all_pass_euler_ring(
     """
     # Create a new cell for the all-pass ring resonator
     all_pass_ring_cell = canvas.create_cell("ALL_PASS_EULER_RING")
+    annotate_cell(all_pass_ring_cell, "all_pass_euler_ring", {
+        "waveguide_width": waveguide_width, "arc_length": arc_length, "straight_length": straight_length, "gap": gap,
+    })
 
     # Create the racetrack resonator
     racetrack = euler_racetrack_resonator(canvas, layer, arc_length, straight_length, waveguide_width)
@@ -64,7 +68,7 @@ def all_pass_euler_ring(
     L = np.sqrt(np.pi / alpha)  # Constant ℓ
 
     # Compute Fresnel integrals to calculate X and Y coordinates
-    fresnel_sin, fresnel_cos = fresnel(1)
+    fresnel_sin, fresnel_cos = fresnel(1, backend="series")
     x_coords = L * fresnel_cos  # C(s/ℓ)
     # y_coords = L * fresnel_sin  # S(s/ℓ)
 
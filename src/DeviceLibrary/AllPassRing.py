@@ -4,6 +4,7 @@ import numpy as np
 from .BasicCurve import *
 from .BasicComponents import *
 from .Resonator import *
+from .CellParameters import *
 
 
 def all_pass_ring(
@@ -56,6 +57,9 @@ def all_pass_ring(
     """
     # Create a new cell for the all-pass ring resonator
     all_pass_ring_cell = canvas.create_cell("ALL_PASS_RING")
+    annotate_cell(all_pass_ring_cell, "all_pass_ring", {
+        "waveguide_width": waveguide_width, "radius": radius, "straight_length": straight_length, "gap": gap,
+    })
 
     # Create the racetrack resonator
     racetrack = racetrack_resonator(canvas, layer, radius, straight_length, waveguide_width)
@@ -2,6 +2,9 @@ import klayout.db as db
 import math
 import numpy as np
 from .BasicCurve import *  # Import all functions from BasicCurve
+from .BasicOperator import *
+from .ShapeConversion import *
+from . import AffineTransform as at
 
 
 def bend_wg(
@@ -30,11 +33,9 @@ def bend_wg(
     """
     bend_cell = canvas.create_cell("BEND")
 
-    # Create points for the bend path
-    points = [db.DPoint(x, y) for x, y in curve_points]
-
     # Create and insert the bend path
-    bend = db.DPath(points, width)
+    curve_points = clean_curve_points(curve_points, grid=canvas.dbu, name=bend_cell.name)
+    bend = to_dpath(curve_points, width)
     bend_cell.shapes(layer).insert(bend)
 
     return bend_cell
@@ -82,8 +83,8 @@ def circle_arc180_wg(
 
     This function generates a 180-degree circular arc waveguide, creates a new
     cell in the layout, and inserts the arc waveguide into the specified layer.
-    It also inserts a point after the first point and before the last point
-    with y-coordinate of 0.001.
+    The arc points are snapped to the grid and redundant vertices are removed
+    with `clean_curve_points`.
 
     Args:
         canvas: The layout object (db.Layout) to which the waveguide will be added.
@@ -113,19 +114,11 @@ def circle_arc180_wg(
     # Generate the 180-degree arc points
     curve_points = circle(center_x=0.0, center_y=0.0, radius=radius, num_points=num_points, angle=180)
 
-    # Insert a new point after the first point with the same x-coordinate but y = 0.001
-    first_point = curve_points[0]
-    curve_points.insert(1, (first_point[0], 0.001))
-
-    # Insert a new point before the last point with the same x-coordinate but y = 0.001
-    last_point = curve_points[-1]
-    curve_points.insert(-1, (last_point[0], 0.001))
-
-    # Create points for the bend path
-    points = [db.DPoint(x, y) for x, y in curve_points]
+    # Snap to the grid and remove redundant vertices, the end points keep the vertical tangents
+    curve_points = clean_curve_points(curve_points, grid=canvas.dbu, name=circle_arc180_cell.name)
 
     # Create and insert the bend path
-    bend = db.DPath(points, width)
+    bend = to_dpath(curve_points, width)
     circle_arc180_cell.shapes(layer).insert(bend)
 
     return circle_arc180_cell
@@ -136,6 +129,7 @@ def euler_arc180_wg(
         arc_length: float,
         width: float,
         num_points: int = 1000,
+        fresnel_backend: str = "scipy",
 ) -> db.Cell:
     """
     Creates a 180-degree Euler arc-shaped waveguide in a layout cell.
@@ -146,6 +140,7 @@ def euler_arc180_wg(
         arc_length: Length of the 180-degree Euler bend waveguide (in microns).
         width: Width of the waveguide (in microns).
         num_points: Number of points to use for generating the Euler curve (default is 1000).
+        fresnel_backend: The backend of the Fresnel integrals, see `fresnel`.
 
     Returns:
         A db.Cell object containing the 180-degree arc waveguide.
@@ -170,26 +165,20 @@ def euler_arc180_wg(
     alpha = np.pi / (s ** 2)
 
     # Generate the points for the bottom curve of the Euler spiral
-    bottom_curve_points = euler_spiral(s=s, alpha=alpha, num_points=num_points)
-
-    # Calculate the y-shift to reflect the curve vertically for the top arc
-    y_shift = 2 * bottom_curve_points[-1][1]
+    bottom_curve_points = euler_spiral(s=s, alpha=alpha, num_points=num_points, fresnel_backend=fresnel_backend)
 
-    # Generate the top curve by reflecting the bottom curve
-    top_curve_points = [(x, -y + y_shift) for x, y in bottom_curve_points]
+    # Generate the top curve by reflecting the bottom curve at the horizontal line through its end
+    bottom_curve_points = np.array(bottom_curve_points)
+    top_curve_points = at.apply_transform(at.mirror("x", offset=bottom_curve_points[-1, 1]), bottom_curve_points)
 
     # Combine the bottom and top curve points to form the full waveguide
-    full_curve_points = bottom_curve_points + top_curve_points[::-1]
+    full_curve_points = np.vstack((bottom_curve_points, top_curve_points[::-1]))
 
-    # Insert additional points to smooth the transition at the start and end of the arc
-    first_point_x, first_point_y = full_curve_points[0]
-    last_point_x, last_point_y = full_curve_points[-1]
-    full_curve_points.insert(1, (first_point_x + 0.001, first_point_y))
-    full_curve_points.insert(-1, (last_point_x + 0.001, last_point_y))
+    # Snap to the grid and remove the duplicated join point and redundant vertices
+    full_curve_points = clean_curve_points(full_curve_points, grid=canvas.dbu, name=euler_arc_cell.name)
 
     # Create the path of the waveguide from the generated points
-    path_points = [db.DPoint(x, y) for x, y in full_curve_points]
-    bend_path = db.DPath(path_points, width)
+    bend_path = to_dpath(full_curve_points, width)
     # bend_path_poly = bend_path.polygon()
 
     # Insert the waveguide into the specified layer
@@ -199,3 +188,45 @@ def euler_arc180_wg(
     return euler_arc_cell
 
 
+
+def variable_width_wg(
+        canvas: db.Layout,
+        layer: int,
+        curve_points: list[tuple[float, float]],
+        width,
+        name: str = "VARIABLE_WIDTH_WG",
+) -> db.Cell:
+    """Create a cell with a waveguide of varying width along a centerline.
+
+    Both edges are offset from the centerline with `variable_width_polygon`,
+    so the curve is evaluated only once, and the waveguide is inserted as a
+    polygon. Each edge is snapped to the grid and cleaned with
+    `clean_curve_points`.
+
+    Args:
+        canvas: The layout object (db.Layout) where the waveguide will be added.
+        layer: The layer index (int) where the waveguide should be inserted.
+        curve_points: The centerline as a list of (x, y) coordinates (in microns).
+        width: The width (in microns), a number, one width per point, or a
+            vectorized function of the arc length along the centerline.
+        name: Name of the created cell.
+
+    Returns:
+        A db.Cell object containing the waveguide.
+
+    Example:
+        .. code::
+
+            taper_cell = variable_width_wg(
+                canvas=layout, layer=layer, curve_points=[(0, 0), (10, 0)],
+                width=lambda s: 0.45 + 0.055 * s,
+            )
+    """
+    wg_cell = canvas.create_cell(name)
+
+    left_edge, right_edge = variable_width_polygon(curve_points, width)
+    left_edge = clean_curve_points(left_edge, grid=canvas.dbu, name=f"{wg_cell.name} left edge")
+    right_edge = clean_curve_points(right_edge, grid=canvas.dbu, name=f"{wg_cell.name} right edge")
+    wg_cell.shapes(layer).insert(to_dpolygon(np.vstack((left_edge, right_edge[::-1]))))
+
+    return wg_cell
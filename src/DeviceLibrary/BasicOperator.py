@@ -1,3 +1,11 @@
+import numpy as np
+from .CurveProfile import *
+
+
+# Vertices removed by `clean_curve_points`, accumulated per curve name
+CURVE_CLEANUP_COUNTS: dict[str, dict[str, int]] = {}
+
+
 def find_middle_point(
         points: list[tuple[float, float]]
 ) -> tuple[float, float]:
@@ -34,3 +42,171 @@ def find_middle_point(
         middle_point = ((point1[0] + point2[0]) / 2, (point1[1] + point2[1]) / 2)
 
     return middle_point
+
+
+def _chord_deviation(
+        points: np.ndarray,
+        kept: np.ndarray,
+        parity: int,
+) -> np.ndarray:
+    """Largest distance of the original points to the chords which skip every candidate vertex.
+
+    The candidates are the interior kept vertices at positions with the given
+    parity. Removing candidate m replaces the segments kept[m - 1] -> kept[m]
+    -> kept[m + 1] by one chord, and every original point between kept[m - 1]
+    and kept[m + 1] has to stay close to that chord.
+    """
+    indices = np.arange(kept[0], kept[-1] + 1)
+    segment = np.searchsorted(kept, indices, side="right") - 1
+    segment = np.minimum(segment, kept.size - 2)
+    candidate = np.where(segment % 2 == parity, segment, segment + 1)
+    valid = (candidate >= 1) & (candidate <= kept.size - 2)
+
+    start = points[kept[np.clip(candidate - 1, 0, kept.size - 1)]]
+    end = points[kept[np.clip(candidate + 1, 0, kept.size - 1)]]
+    chord = end - start
+    offset = points[indices] - start
+    # Distance to the chord segment, with the projection clamped to its ends
+    chord_length2 = np.sum(chord ** 2, axis=1)
+    t = np.clip(np.sum(offset * chord, axis=1) / np.where(chord_length2 > 0, chord_length2, 1), 0, 1)
+    distance = np.hypot(*(offset - t[:, None] * chord).T)
+
+    deviation = np.zeros(kept.size)
+    np.maximum.at(deviation, candidate[valid], distance[valid])
+    return deviation
+
+def clean_curve_points(
+        points,
+        grid: float = 0.001,
+        tolerance: float = None,
+        name: str = "curve",
+) -> np.ndarray:
+    """Snap curve points to the grid and remove redundant vertices.
+
+    Interior vertices are removed while every original point stays within
+    `tolerance` of the simplified polyline. The removal runs in vectorized
+    passes over alternating vertices until nothing changes, and is measured
+    on the exact points, so the grid rounding does not use up the
+    tolerance. The first and last two points are always kept, which keeps
+    the first and last segment and thus the end tangents of the curve.
+    Afterwards the points are snapped to the grid and consecutive
+    duplicates are dropped. The removed vertices are counted per curve
+    name, see `print_curve_cleanup`.
+
+    Args:
+        points: A sequence or (N, 2) array of (x, y) coordinates.
+        grid: The grid to snap to, `canvas.dbu` for coordinates in microns
+            or 1 for coordinates in database units.
+        tolerance: Maximum distance of a removed vertex from the simplified
+            curve. Defaults to half the grid.
+        name: Name of the curve used when reporting the removed vertices.
+
+    Returns:
+        An (M, 2) array of the remaining points, M <= N.
+
+    Example:
+        .. code::
+
+            curve_points = clean_curve_points(euler_arc180_curve(s=25, alpha=np.pi / 625), grid=layout.dbu)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    num_points = len(points)
+    tolerance = grid / 2 if tolerance is None else tolerance
+
+    # Drop points which coincide with their predecessor on the grid
+    snapped = np.round(points / grid) * grid
+    if num_points > 1:
+        unique = np.concatenate(([True], np.any(snapped[1:] != snapped[:-1], axis=1)))
+        points, snapped = points[unique], snapped[unique]
+
+    kept = np.arange(len(points))
+    changed = len(points) > 4
+    while changed:
+        changed = False
+        for parity in (1, 0):
+            if kept.size <= 4:
+                break
+            deviation = _chord_deviation(points, kept, parity)
+            position = np.arange(kept.size)
+            # The end segments are pinned, so the end tangents stay exact
+            removable = (
+                (position % 2 == parity) & (position >= 2) & (position <= kept.size - 3)
+                & (deviation <= tolerance)
+            )
+            if np.any(removable):
+                kept = kept[~removable]
+                changed = True
+
+    points = snapped[kept]
+    counts = CURVE_CLEANUP_COUNTS.setdefault(name, {"curves": 0, "vertices": 0, "removed": 0})
+    counts["curves"] += 1
+    counts["vertices"] += num_points
+    counts["removed"] += num_points - len(points)
+    return points
+
+def print_curve_cleanup(
+        reset: bool = True,
+) -> dict[str, dict[str, int]]:
+    """Print the vertices removed by `clean_curve_points` per curve name.
+
+    Args:
+        reset: Clear the counts after printing.
+
+    Returns:
+        A dictionary mapping the curve name to {"curves", "vertices",
+        "removed"}.
+    """
+    counts = {name: dict(values) for name, values in CURVE_CLEANUP_COUNTS.items()}
+    for name, values in counts.items():
+        print(f"{name}: removed {values['removed']} of {values['vertices']} vertices "
+              f"in {values['curves']} curve(s)")
+    if reset:
+        CURVE_CLEANUP_COUNTS.clear()
+    return counts
+
+def variable_width_polygon(
+        points,
+        width,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Offset both edges of a waveguide from its centerline in one array pass.
+
+    The arc length and heading of the centerline are computed once with
+    `curve_profile`, and every vertex is moved by half the local width along
+    the normal of the heading. The width may vary along the curve, which
+    gives direct control of tapers and adiabatic bends. The centerline
+    radius of curvature must stay above half the width, otherwise the inner
+    edge folds over.
+
+    Args:
+        points: The centerline as a list of (x, y) tuples or an (N, 2) array,
+            e.g. from `circle` or `euler_arc180_curve`.
+        width: The waveguide width, either a number, an array with one width
+            per point, or a vectorized function of the arc length array `s`.
+
+    Returns:
+        A tuple (left_edge, right_edge) of (N, 2) arrays, the edges on the
+        left and right side of the direction of travel.
+
+    Raises:
+        ValueError: If a width is not positive.
+
+    Example:
+        .. code::
+
+            centerline = np.array(euler_arc180_curve(s=10, alpha=np.pi / 100))
+            length = curve_profile(centerline)["s"][-1]
+            left, right = variable_width_polygon(
+                centerline, lambda s: 0.45 + 0.35 * np.sin(np.pi * s / length) ** 2
+            )
+    """
+    points = np.asarray(points, dtype=float)
+    profile = curve_profile(points)
+
+    widths = width(profile["s"]) if callable(width) else width
+    widths = np.broadcast_to(np.asarray(widths, dtype=float), profile["s"].shape)
+    if np.any(widths <= 0):
+        raise ValueError("The waveguide width must be positive along the whole curve.")
+
+    normals = np.stack((-np.sin(profile["heading"]), np.cos(profile["heading"])), axis=-1)
+    offsets = normals * (widths / 2)[:, None]
+    return points + offsets, points - offsets
@@ -0,0 +1,159 @@
+import json
+import math
+import klayout.db as db
+from .LayoutLoader import load_options
+
+
+# GDSII only stores properties with integer keys, so the parameters use an integer key
+PARAMETER_PROPERTY = 101
+
+
+def annotate_cell(
+        cell: db.Cell,
+        generator: str,
+        parameters: dict,
+) -> db.Cell:
+    """Record the generator and its parameters in a cell property.
+
+    The record is stored as JSON under the integer key `PARAMETER_PROPERTY`.
+    It survives GDS round-trips when written with `annotation_save_options`
+    and OASIS round-trips in any case.
+
+    Args:
+        cell: The generated cell.
+        generator: Name of the generator function, e.g. "all_pass_euler_ring".
+        parameters: The geometric parameters, with JSON-serializable values.
+
+    Returns:
+        The annotated cell.
+    """
+    record = {"generator": generator, "parameters": parameters}
+    # NumPy scalars are stored as plain numbers
+    cell.set_property(PARAMETER_PROPERTY, json.dumps(record, default=float))
+    return cell
+
+def cell_parameters(
+        cell: db.Cell,
+) -> dict | None:
+    """The generator record of an annotated cell.
+
+    Returns:
+        A dictionary with the keys "generator" and "parameters", or None if
+        the cell carries no annotation.
+    """
+    record = cell.property(PARAMETER_PROPERTY)
+    return None if record is None else json.loads(record)
+
+def copy_annotated_tree(
+        source_cell: db.Cell,
+        target: db.Layout,
+) -> db.Cell:
+    """Copy a cell with its hierarchy into another layout, keeping the annotations.
+
+    `Cell.copy_tree` copies shapes and instances but no cell properties,
+    so the parameter annotations of the copied cells would be lost.
+
+    Args:
+        source_cell: The cell to copy.
+        target: The layout receiving the copy.
+
+    Returns:
+        The new copy of the source cell in the target layout.
+    """
+    target_cell = target.create_cell(source_cell.name)
+    cell_mapping = db.CellMapping()
+    cell_mapping.for_single_cell_full(target, target_cell.cell_index(), source_cell.layout(), source_cell.cell_index())
+    target_cell.copy_tree_shapes(source_cell, cell_mapping)
+
+    # The mapping table maps the source cell indexes to the target cell indexes
+    source = source_cell.layout()
+    for source_index, target_index in cell_mapping.table().items():
+        for name, value in source.cell(source_index).properties().items():
+            target.cell(target_index).set_property(name, value)
+    return target_cell
+
+def annotation_save_options(
+        options: db.SaveLayoutOptions = None,
+) -> db.SaveLayoutOptions:
+    """Enable writing cell properties to GDS, which the GDSII writer skips by default.
+
+    Args:
+        options: Save options to extend. Defaults to new options.
+
+    Returns:
+        The save options.
+    """
+    options = db.SaveLayoutOptions() if options is None else options
+    options.gds2_write_cell_properties = True
+    return options
+
+def build_parameter_index(
+        file_paths: list[str],
+) -> list[dict]:
+    """Collect the generator records of all annotated cells in layout files.
+
+    The files are read in hierarchy mode with properties enabled, so no
+    geometry is created and large variant libraries are indexed quickly.
+
+    Args:
+        file_paths: The GDS/OASIS files to index.
+
+    Returns:
+        A list of entries, each a dictionary with the keys "file", "cell",
+        "generator" and "parameters". The list is JSON-serializable, so it
+        can be stored next to the layout files.
+
+    Example:
+        .. code::
+
+            index = build_parameter_index(glob.glob("src/output/sweep/*.gds"))
+            rings = query_parameter_index(index, generator="all_pass_euler_ring", gap=0.2)
+    """
+    options = load_options(mode="hierarchy")
+    options.properties_enabled = True
+
+    index = []
+    for file_path in file_paths:
+        layout = db.Layout()
+        layout.read(file_path, options)
+        for cell in layout.each_cell():
+            record = cell_parameters(cell)
+            if record is not None:
+                index.append({"file": file_path, "cell": cell.name, **record})
+    return index
+
+def query_parameter_index(
+        index: list[dict],
+        generator: str = None,
+        tolerance: float = 1e-9,
+        **conditions,
+) -> list[dict]:
+    """Select the entries of a parameter index matching all conditions.
+
+    Args:
+        index: The result of `build_parameter_index`.
+        generator: Only entries of this generator, None for all generators.
+        tolerance: Absolute tolerance of numeric comparisons.
+        conditions: Parameter name and required value, or a predicate
+            function of the value, e.g. `gap=0.2` or
+            `arc_length=lambda value: value > 50`. Entries without the
+            parameter never match.
+
+    Returns:
+        The matching entries.
+    """
+    def matches(parameters: dict, name: str, condition) -> bool:
+        if name not in parameters:
+            return False
+        value = parameters[name]
+        if callable(condition):
+            return bool(condition(value))
+        if isinstance(condition, (int, float)) and isinstance(value, (int, float)):
+            return math.isclose(value, condition, rel_tol=0, abs_tol=tolerance)
+        return value == condition
+
+    return [
+        entry for entry in index
+        if (generator is None or entry["generator"] == generator)
+        and all(matches(entry["parameters"], name, condition) for name, condition in conditions.items())
+    ]
@@ -0,0 +1,167 @@
+import itertools
+import json
+import operator
+import os
+import klayout.db as db
+import numpy as np
+
+
+COLUMNAR_FORMAT = "oeds-columnar"
+COLUMNAR_VERSION = 1
+
+# Coordinates of a db.Point as a tuple, evaluated in C without a Python frame per vertex
+_POINT_COORDINATES = operator.attrgetter("x", "y")
+
+
+def polygon_vertices(
+        region: db.Region,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Hull vertices of all polygons of a region as one array, with polygon offsets.
+
+    The offsets are computed from the vertex counts first, then the
+    coordinates of every polygon are written into their slice of one
+    preallocated array. No Python list of the coordinates is built.
+    Polygons with holes are resolved with cut lines.
+
+    Args:
+        region: The polygons, e.g. a flattened layer of a cell.
+
+    Returns:
+        A tuple (vertices, offsets): an (N, 2) int32 array of the hull
+        vertices in database units, and a (P + 1,) int64 array where
+        polygon i spans the vertices offsets[i]:offsets[i + 1].
+    """
+    # Holes are connected to the hull by cut lines, so every polygon is a single loop
+    if not region.holes().is_empty():
+        region = db.Region([polygon.resolved_holes() if polygon.holes() else polygon for polygon in region.each()])
+
+    offsets = np.zeros(region.count() + 1, dtype=np.int64)
+    np.cumsum([polygon.num_points_hull() for polygon in region.each()], out=offsets[1:])
+
+    vertices = np.empty((offsets[-1], 2), dtype=np.int32)
+    coordinates = vertices.reshape(-1)
+    for start, end, polygon in zip(offsets[:-1], offsets[1:], region.each()):
+        coordinates[2 * start:2 * end] = np.fromiter(
+            itertools.chain.from_iterable(map(_POINT_COORDINATES, polygon.each_point_hull())),
+            dtype=np.int32, count=2 * (end - start),
+        )
+    return vertices, offsets
+
+def export_columnar(
+        canvas: db.Layout,
+        cell: db.Cell,
+        directory: str,
+        parameters: dict = None,
+) -> dict:
+    """Export the flattened polygons of a cell as memory-mappable columnar arrays.
+
+    For every layer two `.npy` files are written: "<layer>_<datatype>.vertices.npy",
+    an (N, 2) int32 array of all hull vertices in database units, and
+    "<layer>_<datatype>.offsets.npy", a (P + 1,) int64 array where polygon i
+    spans the vertices offsets[i]:offsets[i + 1]. Paths and boxes are
+    converted to polygons, polygons with holes are resolved with cut lines,
+    and texts are skipped. A "metadata.json" file holds the cell name, the
+    database unit, the bounding box, the layers and the generator parameters.
+
+    Args:
+        canvas: The layout containing the cell.
+        cell: The cell to export, with its hierarchy flattened.
+        directory: The output directory, created if needed.
+        parameters: Optional JSON-serializable parameters of the generator
+            stored in the metadata.
+
+    Returns:
+        The metadata dictionary written to "metadata.json".
+
+    Example:
+        .. code::
+
+            grating_cell = grating_ansys_lidar(canvas=layout, layer_full_etch=layout.layer(10, 2))
+            export_columnar(layout, grating_cell, "src/output/grating_ansys", parameters={"num_pairs": 20})
+    """
+    os.makedirs(directory, exist_ok=True)
+    bbox = cell.dbbox()
+    metadata = {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "cell": cell.name,
+        "dbu": canvas.dbu,
+        "bbox": [bbox.left, bbox.bottom, bbox.right, bbox.top],
+        "parameters": parameters or {},
+        "layers": {},
+    }
+
+    for layer_index in canvas.layer_indexes():
+        region = db.Region(cell.begin_shapes_rec(layer_index))
+        if region.is_empty():
+            continue
+        info = canvas.get_info(layer_index)
+        vertices, offsets = polygon_vertices(region)
+
+        name = f"{info.layer}_{info.datatype}"
+        np.save(os.path.join(directory, f"{name}.vertices.npy"), vertices)
+        np.save(os.path.join(directory, f"{name}.offsets.npy"), offsets)
+        metadata["layers"][f"{info.layer}/{info.datatype}"] = {
+            "vertices": f"{name}.vertices.npy",
+            "offsets": f"{name}.offsets.npy",
+            "num_polygons": len(offsets) - 1,
+            "num_vertices": len(vertices),
+        }
+
+    with open(os.path.join(directory, "metadata.json"), "w") as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+    return metadata
+
+def load_columnar(
+        directory: str,
+        mmap: bool = True,
+) -> dict:
+    """Load a columnar export written by `export_columnar`.
+
+    Args:
+        directory: The export directory.
+        mmap: Map the arrays read-only instead of reading them into memory.
+
+    Returns:
+        A dictionary with the keys "metadata" (the content of
+        "metadata.json") and "layers", mapping "<layer>/<datatype>" to a
+        dictionary with the arrays "vertices" and "offsets".
+
+    Raises:
+        ValueError: If the directory does not hold a supported export.
+
+    Example:
+        .. code::
+
+            export = load_columnar("src/output/grating_ansys")
+            first_polygon = columnar_polygon(export["layers"]["10/2"], 0) * export["metadata"]["dbu"]
+    """
+    with open(os.path.join(directory, "metadata.json")) as metadata_file:
+        metadata = json.load(metadata_file)
+    if metadata.get("format") != COLUMNAR_FORMAT or metadata.get("version", 0) > COLUMNAR_VERSION:
+        raise ValueError(f"'{directory}' is not a supported columnar geometry export.")
+
+    mmap_mode = "r" if mmap else None
+    layers = {}
+    for layer_name, files in metadata["layers"].items():
+        layers[layer_name] = {
+            "vertices": np.load(os.path.join(directory, files["vertices"]), mmap_mode=mmap_mode),
+            "offsets": np.load(os.path.join(directory, files["offsets"]), mmap_mode=mmap_mode),
+        }
+    return {"metadata": metadata, "layers": layers}
+
+def columnar_polygon(
+        layer_data: dict,
+        index: int,
+) -> np.ndarray:
+    """Vertices of one polygon of a loaded layer, as a view without copying.
+
+    Args:
+        layer_data: One entry of the "layers" dictionary of `load_columnar`.
+        index: The index of the polygon.
+
+    Returns:
+        An (n, 2) int32 array of the hull vertices in database units.
+    """
+    offsets = layer_data["offsets"]
+    return layer_data["vertices"][offsets[index]:offsets[index + 1]]
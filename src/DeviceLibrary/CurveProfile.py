@@ -0,0 +1,216 @@
+import numpy as np
+
+
+def _filled_segment_index(
+        valid: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Index of the nearest valid segment at or before, and at or after, each segment."""
+    num_segments = valid.shape[-1]
+    index = np.arange(num_segments)
+    previous_index = np.maximum.accumulate(np.where(valid, index, -1), axis=-1)
+    next_index = np.flip(
+        np.minimum.accumulate(np.flip(np.where(valid, index, num_segments), axis=-1), axis=-1), axis=-1
+    )
+    # Fall back to the other direction at the ends of the curve
+    previous_index, next_index = (
+        np.where(previous_index < 0, next_index, previous_index),
+        np.where(next_index >= num_segments, previous_index, next_index),
+    )
+    return np.clip(previous_index, 0, num_segments - 1), np.clip(next_index, 0, num_segments - 1)
+
+def curve_profile(
+        points,
+) -> dict[str, np.ndarray]:
+    """Compute arc length, curvature and heading along sampled curves.
+
+    The profile is computed by vectorized finite differences. The heading
+    of each segment is unwrapped along the curve and the curvature at each
+    vertex is the turning angle divided by the mean length of the adjacent
+    segments. Zero-length segments, such as duplicated join points, are
+    skipped. A batch of curves with the same number of points can be passed
+    as a (B, N, 2) array.
+
+    Args:
+        points: A list of (x, y) tuples, an (N, 2) array or a (B, N, 2) array
+            of curves, e.g. from `circle` or `euler_arc180_curve`.
+
+    Returns:
+        A dictionary of arrays with the shape (N,) or (B, N) and the keys
+        "s" (arc length from the first point), "curvature" (signed, positive
+        for left turns) and "heading" (tangent angle in radians).
+
+    Example:
+        .. code::
+
+            profile = curve_profile(euler_arc180_curve(s=50, alpha=np.pi / 50 ** 2))
+            print(1 / np.abs(profile["curvature"]).max())
+    """
+    points = np.asarray(points, dtype=float)
+    if points.shape[-1] != 2 or points.shape[-2] < 2:
+        raise ValueError(f"Expected curves of shape (N, 2) or (B, N, 2) with N >= 2, got {points.shape}.")
+
+    segments = np.diff(points, axis=-2)
+    segment_length = np.hypot(segments[..., 0], segments[..., 1])
+    arc_length = np.concatenate(
+        (np.zeros(segment_length.shape[:-1] + (1,)), np.cumsum(segment_length, axis=-1)), axis=-1
+    )
+
+    # Zero-length segments, e.g. duplicated join points, take the heading and
+    # length of the nearest non-degenerate segment before (or after) them
+    previous_segment, next_segment = _filled_segment_index(segment_length > 0)
+    segment_heading = np.arctan2(segments[..., 1], segments[..., 0])
+    segment_heading = np.unwrap(np.take_along_axis(segment_heading, previous_segment, axis=-1), axis=-1)
+
+    # Vertex headings are the mean of the adjacent segment headings
+    heading = np.concatenate(
+        (
+            segment_heading[..., :1],
+            (segment_heading[..., :-1] + segment_heading[..., 1:]) / 2,
+            segment_heading[..., -1:],
+        ),
+        axis=-1,
+    )
+
+    turning_angle = np.diff(segment_heading, axis=-1)
+    mean_length = (
+        np.take_along_axis(segment_length, previous_segment[..., :-1], axis=-1)
+        + np.take_along_axis(segment_length, next_segment[..., 1:], axis=-1)
+    ) / 2
+    interior_curvature = np.divide(
+        turning_angle, mean_length, out=np.zeros_like(turning_angle), where=mean_length > 0
+    )
+    if interior_curvature.shape[-1] == 0:
+        curvature = np.zeros_like(arc_length)
+    else:
+        curvature = np.concatenate(
+            (interior_curvature[..., :1], interior_curvature, interior_curvature[..., -1:]), axis=-1
+        )
+
+    return {"s": arc_length, "curvature": curvature, "heading": heading}
+
+def circle_profile(
+        radius: float = 1,
+        num_points: int = 360,
+        angle: float = 180,
+) -> dict[str, np.ndarray]:
+    """Closed-form profile of the arc generated by `circle`.
+
+    Args:
+        radius: Radius of the circle.
+        num_points: Number of points of the arc.
+        angle: Angle of the arc (in degrees).
+
+    Returns:
+        A dictionary of arrays with the keys "s", "curvature" and "heading",
+        see `curve_profile`.
+    """
+    angles = np.linspace(0, np.pi * angle / 180, num_points)
+    return {
+        "s": radius * angles,
+        "curvature": np.full(num_points, 1 / radius),
+        "heading": angles + np.pi / 2,
+    }
+
+def euler_spiral_profile(
+        s: float,
+        alpha: float,
+        num_points: int = 1000,
+) -> dict[str, np.ndarray]:
+    """Closed-form profile of the spiral generated by `euler_spiral`.
+
+    The curvature of the Euler spiral grows linearly with the arc length,
+    kappa = alpha * s, and the heading is alpha * s^2 / 2.
+
+    Args:
+        s: Arc length of the spiral.
+        alpha: The alpha value controlling the curvature.
+        num_points: Number of points of the spiral.
+
+    Returns:
+        A dictionary of arrays with the keys "s", "curvature" and "heading",
+        see `curve_profile`.
+    """
+    s_vals = np.linspace(0, s, num_points)
+    return {
+        "s": s_vals,
+        "curvature": alpha * s_vals,
+        "heading": alpha * s_vals ** 2 / 2,
+    }
+
+def euler_arc180_profile(
+        s: float,
+        alpha: float,
+        num_points: int = 2000,
+) -> dict[str, np.ndarray]:
+    """Closed-form profile of the 180-degree bend generated by `euler_arc180_curve`.
+
+    The profile follows the two mirrored spiral halves of 2 * num_points
+    points; the two helper points inserted next to the end points of the
+    curve are not included.
+
+    Args:
+        s: Arc length of each spiral half.
+        alpha: The alpha value controlling the curvature.
+        num_points: Number of points of each spiral half.
+
+    Returns:
+        A dictionary of arrays with the keys "s", "curvature" and "heading",
+        see `curve_profile`.
+    """
+    half = euler_spiral_profile(s=s, alpha=alpha, num_points=num_points)
+    mirrored_s = half["s"][::-1]
+    return {
+        "s": np.concatenate((half["s"], 2 * s - mirrored_s)),
+        "curvature": np.concatenate((half["curvature"], alpha * mirrored_s)),
+        "heading": np.concatenate((half["heading"], np.pi - alpha * mirrored_s ** 2 / 2)),
+    }
+
+def min_bend_radius(
+        profile: dict[str, np.ndarray],
+) -> np.ndarray:
+    """Minimum bend radius of one or a batch of curve profiles.
+
+    Args:
+        profile: A profile from `curve_profile` or one of the closed-form
+            profile functions.
+
+    Returns:
+        The minimum bend radius, a scalar array or one value per curve.
+    """
+    with np.errstate(divide="ignore"):
+        return 1 / np.abs(profile["curvature"]).max(axis=-1)
+
+def bend_loss_db(
+        profile: dict[str, np.ndarray],
+        loss_amplitude: float,
+        loss_decay: float,
+) -> np.ndarray:
+    """Integrated bend loss for an exponential loss-versus-radius model.
+
+    The loss per unit length at bend radius R = 1 / |kappa| is modelled as
+    `loss_amplitude * exp(-loss_decay * R)` and integrated along the arc
+    length with the trapezoidal rule. Straight sections do not contribute.
+    The coefficients are fitted by the user for the waveguide cross
+    section, e.g. from mode solver results.
+
+    Args:
+        profile: A profile from `curve_profile` or one of the closed-form
+            profile functions, or a batch of profiles of shape (B, N).
+        loss_amplitude: Loss per length at zero radius (in dB/micron).
+        loss_decay: Decay constant of the loss with the radius (in 1/micron).
+
+    Returns:
+        The bend loss (in dB), a scalar array or one value per curve.
+
+    Example:
+        .. code::
+
+            circular = bend_loss_db(circle_profile(radius=5, num_points=1000), 1.0, 1.2)
+            euler = bend_loss_db(euler_arc180_profile(s=7.85, alpha=np.pi / 7.85 ** 2), 1.0, 1.2)
+    """
+    curvature = np.abs(profile["curvature"])
+    with np.errstate(divide="ignore", over="ignore"):
+        loss_per_length = np.where(
+            curvature > 0, loss_amplitude * np.exp(-loss_decay / np.maximum(curvature, 1e-300)), 0.0
+        )
+    return np.trapezoid(loss_per_length, profile["s"], axis=-1)
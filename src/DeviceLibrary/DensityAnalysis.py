@@ -0,0 +1,147 @@
+import math
+import klayout.db as db
+import numpy as np
+
+
+class _DensityReceiver(db.TileOutputReceiver):
+    """Collects the density value of every tile into a NumPy grid."""
+
+    def __init__(self, grid: np.ndarray):
+        self.grid = grid
+
+    def put(self, ix, iy, tile, obj, dbu, clip):
+        self.grid[iy, ix] = obj
+
+def _layer_name(
+        canvas: db.Layout,
+        layer_index: int,
+) -> str:
+    """The "layer/datatype" name of a layer index."""
+    info = canvas.get_info(layer_index)
+    return f"{info.layer}/{info.datatype}"
+
+def density_map(
+        canvas: db.Layout,
+        cell: db.Cell,
+        layers: list[int],
+        window: float = 100.0,
+        step: float = 50.0,
+        threads: int = 4,
+        bbox: db.DBox = None,
+        merge: bool = True,
+) -> dict:
+    """Pattern density of several layers in sliding windows.
+
+    The analyzed area is cut into step x step tiles, and one multi-threaded
+    klayout `TilingProcessor` pass over the flattened cell measures the
+    covered area of every tile on all layers. The window densities are then
+    summed from the tile areas in NumPy, so overlapping windows do not
+    process any geometry twice.
+
+    Args:
+        canvas: The layout containing the cell.
+        cell: The cell to analyze, with its hierarchy flattened.
+        layers: The layer indexes to analyze, e.g.
+            `[layer_full_etch, layer_partial_etch]`.
+        window: Edge length of the density window (in microns), a multiple
+            of the step.
+        step: Distance between the window positions (in microns).
+        threads: Number of threads used by the tiling processor.
+        bbox: The analyzed area. Defaults to the bounding box of the cell.
+        merge: Merge the shapes of each tile before measuring their area.
+            Without merging, overlapping shapes are counted twice, but the
+            analysis is about ten times faster for curved devices.
+
+    Returns:
+        A dictionary with the keys "x" and "y" (window centers in microns),
+        "window", "step" and "layers", which maps every "layer/datatype"
+        name to an array of shape (len(y), len(x)) with densities from 0 to 1.
+
+    Raises:
+        ValueError: If the window is not a positive multiple of the step.
+
+    Example:
+        .. code::
+
+            density = density_map(layout, grating_cell, [layer_full_etch, layer_partial_etch], window=50, step=25)
+            violations = density_violations(density, min_density=0.2, max_density=0.8)
+    """
+    tiles_per_window = round(window / step) if step > 0 else 0
+    if tiles_per_window < 1 or not math.isclose(tiles_per_window * step, window):
+        raise ValueError("The window must be a positive multiple of the step.")
+
+    # At least one full window, tiles beyond the analyzed area are empty
+    bbox = cell.dbbox() if bbox is None else bbox
+    num_x = max(tiles_per_window, math.ceil(round(bbox.width() / step, 9)))
+    num_y = max(tiles_per_window, math.ceil(round(bbox.height() / step, 9)))
+
+    processor = db.TilingProcessor()
+    processor.dbu = canvas.dbu
+    processor.threads = threads
+    processor.tile_size(step, step)
+    processor.tile_origin(bbox.left, bbox.bottom)
+    processor.tiles(num_x, num_y)
+
+    tile_areas = {}
+    for i, layer_index in enumerate(layers):
+        grid = np.zeros((num_y, num_x))
+        tile_areas[_layer_name(canvas, layer_index)] = grid
+        processor.input(f"l{i}", canvas, cell.cell_index(), layer_index)
+        processor.output(f"o{i}", _DensityReceiver(grid))
+        semantics = "" if merge else f"l{i}.merged_semantics = false; "
+        processor.queue(f"{semantics}_output(o{i}, to_f(l{i}.area(_tile.bbox)))")
+    processor.execute("Density")
+
+    # Window sums of tile areas from the two-dimensional cumulative sum
+    window_area = (window / canvas.dbu) ** 2
+    densities = {}
+    for layer_name, grid in tile_areas.items():
+        cumulative = np.zeros((num_y + 1, num_x + 1))
+        cumulative[1:, 1:] = grid.cumsum(axis=0).cumsum(axis=1)
+        k = tiles_per_window
+        window_sums = cumulative[k:, k:] - cumulative[:-k, k:] - cumulative[k:, :-k] + cumulative[:-k, :-k]
+        densities[layer_name] = window_sums / window_area
+
+    return {
+        "x": bbox.left + step * np.arange(num_x - tiles_per_window + 1) + window / 2,
+        "y": bbox.bottom + step * np.arange(num_y - tiles_per_window + 1) + window / 2,
+        "window": window,
+        "step": step,
+        "layers": densities,
+    }
+
+def density_violations(
+        density: dict,
+        min_density: float = None,
+        max_density: float = None,
+) -> list[dict]:
+    """Windows of a density map outside the allowed density range.
+
+    Args:
+        density: The result of `density_map`.
+        min_density: Lowest allowed density, None for no limit.
+        max_density: Highest allowed density, None for no limit.
+
+    Returns:
+        A list of violations, each a dictionary with the keys "layer",
+        "window" (db.DBox of the window in microns), "density" and
+        "limit" ("min" or "max").
+    """
+    half = density["window"] / 2
+    violations = []
+    for layer_name, grid in density["layers"].items():
+        masks = {}
+        if min_density is not None:
+            masks["min"] = grid < min_density
+        if max_density is not None:
+            masks["max"] = grid > max_density
+        for limit, mask in masks.items():
+            for iy, ix in zip(*np.nonzero(mask)):
+                x, y = density["x"][ix], density["y"][iy]
+                violations.append({
+                    "layer": layer_name,
+                    "window": db.DBox(x - half, y - half, x + half, y + half),
+                    "density": float(grid[iy, ix]),
+                    "limit": limit,
+                })
+    return violations
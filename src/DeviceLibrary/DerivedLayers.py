@@ -0,0 +1,204 @@
+import re
+import time
+import klayout.db as db
+from .LayoutSearch import *
+
+
+# Boolean operations of the derived-layer rules and their infix symbols in rule strings
+BOOLEAN_OPERATIONS = {"or": "+", "and": "&", "not": "-", "xor": "^"}
+
+_LAYER_PATTERN = r"\d+/\d+"
+_FUNCTION_RULE = re.compile(rf"^\s*({_LAYER_PATTERN})\s*=\s*(size|bbox)\(\s*({_LAYER_PATTERN}|\*)\s*,\s*([-+]?[\d.eE+-]+)\s*\)\s*$")
+_BOOLEAN_RULE = re.compile(rf"^\s*({_LAYER_PATTERN})\s*=\s*({_LAYER_PATTERN})\s*([-+&^])\s*({_LAYER_PATTERN})\s*$")
+# Suffixes klayout appends to the names of cells it copies ("$1") or splits into variants ("$VAR1")
+_CELL_COPY_SUFFIX = re.compile(r"\$(VAR)?\d+$")
+
+
+def _layer_info(
+        layer: str | tuple[int, int],
+) -> db.LayerInfo:
+    """LayerInfo of a "layer/datatype" string or a (layer, datatype) tuple."""
+    if isinstance(layer, str):
+        layer = layer.split("/")
+    return db.LayerInfo(int(layer[0]), int(layer[1]))
+
+def _restore_cell_names(
+        canvas: db.Layout,
+        names: set[str],
+) -> None:
+    """Give cells copied by a deep-mode `insert_into` the names of the cells they replace.
+
+    Where instances of a cell need different results, e.g. magnified
+    instances, klayout replaces the cell by a copy "D$1" and variants
+    "D$VAR1". The copy gets the original name "D" back, the variants keep
+    their names.
+
+    Args:
+        canvas: The layout.
+        names: The cell names before the insertion.
+    """
+    copies = [
+        (match.group(1) is not None, cell.cell_index(), cell)
+        for cell in canvas.each_cell()
+        if cell.name not in names and (match := _CELL_COPY_SUFFIX.search(cell.name))
+    ]
+    # Plain copies come before variants, so a copy takes the name if there is one
+    for _, _, cell in sorted(copies, key=lambda copy: copy[:2]):
+        name = _CELL_COPY_SUFFIX.sub("", cell.name)
+        if name in names and not canvas.has_cell(name):
+            cell.name = name
+
+def parse_rule(
+        text: str,
+) -> dict:
+    """Parse a derived-layer rule string into a rule dictionary.
+
+    Supported forms are "<out> = size(<in>, <distance>)",
+    "<out> = bbox(<in>, <margin>)" (with "*" for all layers) and
+    "<out> = <a> <op> <b>" with the operators "+" (or), "&" (and),
+    "-" (not) and "^" (xor). Layers are written as "layer/datatype" and
+    distances in microns.
+
+    Args:
+        text: The rule, e.g. "11/4 = size(10/2, 2)".
+
+    Returns:
+        A rule dictionary as accepted by `derive_layers`.
+
+    Raises:
+        ValueError: If the rule cannot be parsed.
+    """
+    match = _FUNCTION_RULE.match(text)
+    if match:
+        output, operation, layer, value = match.groups()
+        return {
+            "output": output,
+            "operation": operation,
+            "inputs": [] if layer == "*" else [layer],
+            "value": float(value),
+        }
+    match = _BOOLEAN_RULE.match(text)
+    if match:
+        output, first, symbol, second = match.groups()
+        operation = next(name for name, operator in BOOLEAN_OPERATIONS.items() if operator == symbol)
+        return {"output": output, "operation": operation, "inputs": [first, second]}
+    raise ValueError(f"Cannot parse the derived-layer rule '{text}'.")
+
+def derive_layers(
+        canvas: db.Layout,
+        cell: db.Cell,
+        rules: list[dict | str],
+        threads: int = 4,
+) -> dict:
+    """Compute derived layers such as claddings, slabs and keep-out zones.
+
+    The rules are evaluated in order on the hierarchy below the cell, so a
+    rule may use the output of an earlier one. Sizing and booleans run in
+    klayout deep mode with a multi-threaded `DeepShapeStore`: every cell is
+    processed once however often it is placed, and the results are inserted
+    hierarchically into the existing cells instead of regenerating the
+    devices with other widths. Bounding box rules insert one box per device
+    cell. The results are added to shapes already on the output layers.
+
+    If instances of a cell need different results, e.g. magnified
+    instances, klayout splits the cell into variants. The variant of the
+    original cell keeps its name, the others are named "<cell>$VAR<n>", so
+    name patterns should allow for them, e.g. "ALL_PASS_*" rather than an
+    exact name. Cell objects below `cell` may be replaced; look cells up by
+    name after the call.
+
+    Args:
+        canvas: The layout containing the cell.
+        cell: The cell whose hierarchy is processed, e.g. the top cell.
+        rules: Rule strings (see `parse_rule`) or dictionaries with the keys
+            "output" and "inputs" (layers as "layer/datatype" or tuples),
+            "operation" ("size", "bbox" or one of `BOOLEAN_OPERATIONS`) and
+            "value" (sizing distance or bbox margin in microns). A bbox rule
+            takes the bounding box of its input layers (all layers if none
+            are given) and may select the cells with a glob pattern "cells",
+            which defaults to the processed cell.
+        threads: Number of threads of the deep shape store.
+
+    Returns:
+        A dictionary with the keys "layers" (output "layer/datatype" ->
+        layer index) and "time" (seconds).
+
+    Raises:
+        ValueError: If a rule has an unknown operation or the wrong number
+            of inputs.
+
+    Example:
+        .. code::
+
+            derive_layers(layout, top_cell, [
+                "11/4 = size(10/2, 2)",
+                "12/0 = 11/4 - 10/2",
+                {"output": "20/0", "operation": "bbox", "inputs": [], "value": 5, "cells": "ALL_PASS_*"},
+            ])
+    """
+    start_time = time.perf_counter()
+    store = db.DeepShapeStore()
+    store.threads = threads
+
+    regions = {}
+
+    def region(layer: str | tuple[int, int]) -> db.Region:
+        info = _layer_info(layer)
+        key = (info.layer, info.datatype)
+        if key not in regions:
+            regions[key] = db.Region(cell.begin_shapes_rec(canvas.layer(info)), store)
+        return regions[key]
+
+    outputs = {}
+    for rule in rules:
+        rule = parse_rule(rule) if isinstance(rule, str) else rule
+        operation = rule["operation"]
+        inputs = list(rule.get("inputs", []))
+        info = _layer_info(rule["output"])
+        output_layer = canvas.layer(info)
+        outputs[f"{info.layer}/{info.datatype}"] = output_layer
+
+        if operation == "bbox":
+            margin = rule.get("value", 0.0)
+            input_layers = [canvas.layer(_layer_info(layer)) for layer in inputs]
+            pattern = rule.get("cells")
+            if pattern is None:
+                targets = [cell]
+            else:
+                below = set(cell.called_cells()) | {cell.cell_index()}
+                targets = [target for target in match_cell_names(canvas, pattern) if target.cell_index() in below]
+            for target in targets:
+                bbox = db.Box()
+                for layer_index in input_layers or [None]:
+                    bbox += target.bbox() if layer_index is None else target.bbox(layer_index)
+                if not bbox.empty():
+                    target.shapes(output_layer).insert(bbox.enlarged(round(margin / canvas.dbu)))
+            regions.pop((info.layer, info.datatype), None)
+            continue
+
+        if operation == "size":
+            if len(inputs) != 1:
+                raise ValueError(f"A size rule takes one input layer, got {len(inputs)}.")
+            result = region(inputs[0]).sized(round(rule["value"] / canvas.dbu))
+        elif operation in BOOLEAN_OPERATIONS:
+            if len(inputs) != 2:
+                raise ValueError(f"A boolean rule takes two input layers, got {len(inputs)}.")
+            first, second = region(inputs[0]), region(inputs[1])
+            if operation == "or":
+                result = first | second
+            elif operation == "and":
+                result = first & second
+            elif operation == "not":
+                result = first - second
+            else:
+                result = first ^ second
+        else:
+            raise ValueError(f"Unknown derived-layer operation '{operation}'.")
+
+        names = {target.name for target in canvas.each_cell()}
+        result.insert_into(canvas, cell.cell_index(), output_layer)
+        _restore_cell_names(canvas, names)
+        # A later rule using this layer reads it back from the layout, including earlier shapes
+        regions.pop((info.layer, info.datatype), None)
+
+    return {"layers": outputs, "time": time.perf_counter() - start_time}
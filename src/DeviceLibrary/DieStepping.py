@@ -0,0 +1,161 @@
+import klayout.db as db
+import numpy as np
+
+
+def grid_rectangles(
+        mask: np.ndarray,
+) -> list[tuple[int, int, int, int]]:
+    """Decompose the occupied sites of a grid into rectangles.
+
+    Each row is split into runs of occupied sites, and runs with the same
+    columns in consecutive rows are merged, so every rectangle can be placed
+    as one regular instance array.
+
+    Args:
+        mask: A boolean array of shape (rows, columns), True for occupied sites.
+
+    Returns:
+        A list of (column, row, num_columns, num_rows) tuples.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rectangles = []
+    open_runs = {}
+    for row in range(mask.shape[0] + 1):
+        runs = set()
+        if row < mask.shape[0]:
+            # Run starts and ends from the edges of the padded row
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], mask[row].astype(np.int8), [0]))))
+            runs = {(int(start), int(end - start)) for start, end in zip(edges[::2], edges[1::2])}
+
+        # Close the rectangles which do not continue in this row
+        for run in list(open_runs):
+            if run not in runs:
+                start_row = open_runs.pop(run)
+                rectangles.append((run[0], start_row, run[1], row - start_row))
+        for run in runs:
+            open_runs.setdefault(run, row)
+
+    return sorted(rectangles, key=lambda rectangle: (rectangle[1], rectangle[0]))
+
+def _label_cell(
+        canvas: db.Layout,
+        layer: int,
+        text: str,
+        size: float,
+        polygons: bool,
+) -> db.Cell:
+    """Create a cell holding one label, as a text object or as text polygons."""
+    label_cell = canvas.create_cell(f"LABEL_{text}")
+    if polygons:
+        generator = db.TextGenerator.default_generator()
+        label_cell.shapes(layer).insert(generator.text(text, canvas.dbu, size / generator.dheight()))
+    else:
+        label_cell.shapes(layer).insert(db.DText(text, db.DTrans(), size, -1))
+    return label_cell
+
+def step_dies(
+        canvas: db.Layout,
+        die_cell: db.Cell,
+        pitch_x: float,
+        pitch_y: float,
+        columns: int,
+        rows: int,
+        exclusions: set[tuple[int, int]] = None,
+        overrides: dict[tuple[int, int], db.Cell] = None,
+        label_layer: int = None,
+        label_size: float = 20.0,
+        label_offset: tuple[float, float] = (0.0, 0.0),
+        label_polygons: bool = False,
+) -> db.Cell:
+    """Step a die cell over a wafer or reticle grid with hierarchical instance arrays.
+
+    The occupied sites of the die cell and of every override cell are
+    decomposed into rectangles, and each rectangle becomes one regular
+    `db.DCellInstArray`. A full grid without exclusions is a single array
+    instance, independent of the number of dies.
+
+    Row and column labels are shared sub-cells: one label cell per column
+    ("C<column>") and per row ("R<row>"), each placed with instance arrays
+    over the occupied sites of its column or row.
+
+    Args:
+        canvas: The layout object where the stepped array will be created.
+        die_cell: The die cell to repeat.
+        pitch_x: The horizontal step (in microns).
+        pitch_y: The vertical step (in microns).
+        columns: The number of columns.
+        rows: The number of rows.
+        exclusions: Set of (column, row) sites left empty.
+        overrides: Dictionary mapping (column, row) sites to a cell placed
+            instead of the die cell. Sites sharing the same override cell are
+            arrayed together.
+        label_layer: If given, the layer index for the row and column labels.
+        label_size: Height of the labels (in microns).
+        label_offset: Position of the column label inside each die (in
+            microns); the row label is placed above it.
+        label_polygons: Draw the labels as polygons instead of text objects.
+
+    Returns:
+        A db.Cell object containing the stepped dies.
+
+    Example:
+        .. code::
+
+            reticle = step_dies(
+                canvas=layout, die_cell=test_die, pitch_x=500, pitch_y=500,
+                columns=100, rows=100, exclusions={(0, 0), (99, 99)},
+                label_layer=layout.layer(100, 0),
+            )
+    """
+    exclusions = set() if exclusions is None else set(exclusions)
+    overrides = {} if overrides is None else dict(overrides)
+
+    top_cell = canvas.create_cell("DIE_ARRAY")
+    step_x = db.DVector(pitch_x, 0)
+    step_y = db.DVector(0, pitch_y)
+
+    # Assign every site to the cell placed there
+    site_cells = {die_cell.cell_index(): np.ones((rows, columns), dtype=bool)}
+    for column, row in exclusions | set(overrides):
+        if not (0 <= column < columns and 0 <= row < rows):
+            raise ValueError(f"Site ({column}, {row}) is outside the {columns} x {rows} grid.")
+        site_cells[die_cell.cell_index()][row, column] = False
+    for (column, row), override_cell in overrides.items():
+        if (column, row) in exclusions:
+            continue
+        mask = site_cells.setdefault(override_cell.cell_index(), np.zeros((rows, columns), dtype=bool))
+        mask[row, column] = True
+
+    for cell_index, mask in site_cells.items():
+        for column, row, num_columns, num_rows in grid_rectangles(mask):
+            top_cell.insert(db.DCellInstArray(
+                cell_index,
+                db.DTrans(db.DVector(column * pitch_x, row * pitch_y)),
+                step_x, step_y, num_columns, num_rows,
+            ))
+
+    if label_layer is not None:
+        occupied = np.ones((rows, columns), dtype=bool)
+        for column, row in exclusions:
+            occupied[row, column] = False
+
+        column_label_offset = db.DVector(*label_offset)
+        row_label_offset = column_label_offset + db.DVector(0, 1.5 * label_size)
+        for column in range(columns):
+            label = _label_cell(canvas, label_layer, f"C{column}", label_size, label_polygons)
+            for _, row, _, num_rows in grid_rectangles(occupied[:, column:column + 1]):
+                top_cell.insert(db.DCellInstArray(
+                    label.cell_index(),
+                    db.DTrans(db.DVector(column * pitch_x, row * pitch_y) + column_label_offset),
+                    step_x, step_y, 1, num_rows,
+                ))
+        for row in range(rows):
+            label = _label_cell(canvas, label_layer, f"R{row}", label_size, label_polygons)
+            for column, _, num_columns, _ in grid_rectangles(occupied[row:row + 1, :]):
+                top_cell.insert(db.DCellInstArray(
+                    label.cell_index(),
+                    db.DTrans(db.DVector(column * pitch_x, row * pitch_y) + row_label_offset),
+                    step_x, step_y, num_columns, 1,
+                ))
+
+    return top_cell
@@ -0,0 +1,262 @@
+import collections
+import json
+import os
+import socket
+import socketserver
+import time
+import klayout.db as db
+from .CellParameters import *
+from .BasicComponents import *
+from .Resonator import *
+from .AllPassRing import *
+from .AllPassEulerRing import *
+from .AllPassAdiabaticEulerRing import *
+from .GratingLidarNature import *
+from .GratingLidarAnsys import *
+
+
+# Generators which can be requested by name in a job
+DAEMON_GENERATORS = {
+    "straight_wg": straight_wg,
+    "circle_arc180_wg": circle_arc180_wg,
+    "euler_arc180_wg": euler_arc180_wg,
+    "racetrack_resonator": racetrack_resonator,
+    "euler_racetrack_resonator": euler_racetrack_resonator,
+    "adiabatic_euler_racetrack_resonator": adiabatic_euler_racetrack_resonator,
+    "all_pass_ring": all_pass_ring,
+    "all_pass_euler_ring": all_pass_euler_ring,
+    "all_pass_adiabatic_euler_ring": all_pass_adiabatic_euler_ring,
+    "grating_nature_lidar": grating_nature_lidar,
+    "grating_ansys_lidar": grating_ansys_lidar,
+}
+
+# Generator arguments which take a layer index, given as [layer, datatype] in a job
+_LAYER_ARGUMENTS = ("layer", "layer_full_etch", "layer_partial_etch")
+
+DEFAULT_SOCKET_PATH = "/tmp/oeds_daemon.sock"
+
+# Number of device layouts the daemon keeps in its cache by default
+DEFAULT_MAX_CACHED_CELLS = 256
+
+
+def _device_key(
+        device: dict,
+) -> str:
+    """Cache key of a device specification, independent of its placement."""
+    return json.dumps(
+        {"generator": device["generator"], "params": device.get("params", {})}, sort_keys=True
+    )
+
+def generate_device(
+        canvas: db.Layout,
+        device: dict,
+) -> db.Cell:
+    """Run the generator of one device specification in a layout.
+
+    Args:
+        canvas: The layout receiving the device.
+        device: The device specification, see `run_job`. The "position" is
+            ignored.
+
+    Returns:
+        The generated device cell.
+
+    Raises:
+        ValueError: If the generator is not in `DAEMON_GENERATORS`.
+    """
+    generator = DAEMON_GENERATORS.get(device["generator"])
+    if generator is None:
+        raise ValueError(f"Unknown generator '{device['generator']}'.")
+
+    params = dict(device.get("params", {}))
+    for name in _LAYER_ARGUMENTS:
+        if isinstance(params.get(name), (list, tuple)):
+            params[name] = canvas.layer(*params[name])
+    return generator(canvas=canvas, **params)
+
+def run_job(
+        job: dict,
+        cell_cache: collections.OrderedDict = None,
+        max_cached_cells: int = None,
+) -> dict:
+    """Generate the devices of a job and write them to the requested file.
+
+    A job is a dictionary with the keys "output" (path of the GDS/OASIS file
+    to write), "devices" (list of device specifications) and optionally
+    "top_cell" (name of the top cell, default "TOP"). Each device
+    specification holds "generator" (a name from `DAEMON_GENERATORS`),
+    "params" (keyword arguments of the generator, layers given as
+    [layer, datatype]) and optionally "position" ([x, y] in microns).
+
+    Args:
+        job: The job dictionary.
+        cell_cache: Optional OrderedDict of already generated devices (one
+            db.Layout each), keyed by generator and parameters. Devices found
+            in the cache are copied instead of generated, new devices are
+            added to it.
+        max_cached_cells: Maximum number of devices in the cache. The least
+            recently used devices are dropped beyond it. None for no limit.
+
+    Returns:
+        A dictionary with the keys "status", "output", "cache_hits" and
+        "timings" (seconds for "generate", "write" and "total").
+
+    Example:
+        .. code::
+
+            run_job({
+                "output": "src/output/ring.gds",
+                "devices": [{"generator": "all_pass_euler_ring", "params": {"layer": [1, 0], "arc_length": 80}}],
+            })
+    """
+    start_time = time.perf_counter()
+    canvas = db.Layout()
+    top_cell = canvas.create_cell(job.get("top_cell", "TOP"))
+
+    cache_hits = 0
+    for device in job["devices"]:
+        key = _device_key(device)
+        if cell_cache is not None and key in cell_cache:
+            cached_layout = cell_cache[key]
+            cached_cell = cached_layout.top_cell()
+            device_cell = copy_annotated_tree(cached_cell, canvas)
+            cell_cache.move_to_end(key)
+            cache_hits += 1
+        else:
+            device_cell = generate_device(canvas, device)
+            if cell_cache is not None:
+                cached_layout = db.Layout()
+                cached_layout.dbu = canvas.dbu
+                copy_annotated_tree(device_cell, cached_layout)
+                cell_cache[key] = cached_layout
+                while max_cached_cells is not None and len(cell_cache) > max_cached_cells:
+                    cell_cache.popitem(last=False)
+
+        position = db.DVector(*device.get("position", (0.0, 0.0)))
+        top_cell.insert(db.DCellInstArray(device_cell.cell_index(), db.DTrans(position)))
+
+    generate_time = time.perf_counter()
+    output_dir = os.path.dirname(job["output"])
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    canvas.write(job["output"], annotation_save_options())
+    write_time = time.perf_counter()
+
+    return {
+        "status": "ok",
+        "output": job["output"],
+        "cache_hits": cache_hits,
+        "timings": {
+            "generate": generate_time - start_time,
+            "write": write_time - generate_time,
+            "total": write_time - start_time,
+        },
+    }
+
+def _warm_up() -> float:
+    """Run every generator once with its defaults, so that all code paths are loaded."""
+    start_time = time.perf_counter()
+    canvas = db.Layout()
+    layer = canvas.layer(1, 0)
+    for name in ("all_pass_ring", "all_pass_euler_ring", "all_pass_adiabatic_euler_ring"):
+        DAEMON_GENERATORS[name](canvas=canvas, layer=layer)
+    grating_nature_lidar(canvas=canvas, layer_full_etch=layer, layer_partial_etch=layer)
+    grating_ansys_lidar(canvas=canvas, layer_full_etch=layer)
+    return time.perf_counter() - start_time
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request per connection."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        # A connection without request is a probe, e.g. of a second daemon checking the socket
+        if not line.strip():
+            return
+        try:
+            request = json.loads(line)
+            command = request.get("command", "run")
+            if command == "ping":
+                response = {"status": "ok", "cached_cells": len(self.server.cell_cache)}
+            elif command == "shutdown":
+                response = {"status": "ok"}
+                self.server.shutdown_requested = True
+            elif command == "clear_cache":
+                self.server.cell_cache.clear()
+                response = {"status": "ok"}
+            else:
+                response = run_job(request["job"], self.server.cell_cache, self.server.max_cached_cells)
+        except Exception as e:
+            response = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write((json.dumps(response) + "\n").encode())
+
+def serve(
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        warm_up: bool = True,
+        max_cached_cells: int = DEFAULT_MAX_CACHED_CELLS,
+) -> None:
+    """Run the generation daemon on a Unix-domain socket until it is shut down.
+
+    The daemon keeps DeviceLibrary, klayout, NumPy and SciPy loaded and holds
+    a cache of generated device cells, so repeated jobs only pay for the
+    devices that changed and for writing the output. The cache holds the
+    most recently used devices, so a long sweep does not grow without
+    bound. Jobs are processed one at a time.
+
+    Args:
+        socket_path: Path of the Unix-domain socket.
+        warm_up: Run every generator once before accepting jobs.
+        max_cached_cells: Maximum number of cached devices, None for no limit.
+
+    Raises:
+        OSError: If the platform does not support Unix-domain sockets, or
+            another daemon is already listening on the socket.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix-domain sockets are not supported on this platform.")
+    if os.path.exists(socket_path):
+        # Only a stale socket left by a crashed daemon is removed
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(socket_path)
+            else:
+                raise OSError(f"A generation daemon is already listening on '{socket_path}'.")
+
+    with socketserver.UnixStreamServer(socket_path, _JobHandler) as server:
+        server.cell_cache = collections.OrderedDict()
+        server.max_cached_cells = max_cached_cells
+        server.shutdown_requested = False
+        if warm_up:
+            print(f"Warm-up done in {_warm_up():.2f} s")
+        print(f"Generation daemon listening on {socket_path}")
+        try:
+            while not server.shutdown_requested:
+                server.handle_request()
+        finally:
+            os.remove(socket_path)
+
+def submit_job(
+        job: dict = None,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        command: str = "run",
+        timeout: float = None,
+) -> dict:
+    """Send a job or command to a running generation daemon.
+
+    Args:
+        job: The job dictionary for the "run" command, see `run_job`.
+        socket_path: Path of the daemon's Unix-domain socket.
+        command: One of "run", "ping", "clear_cache" or "shutdown".
+        timeout: Optional socket timeout (in seconds).
+
+    Returns:
+        The response dictionary of the daemon, for "run" the result of
+        `run_job` or {"status": "error", "error": ...}.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall((json.dumps({"command": command, "job": job}) + "\n").encode())
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
@@ -0,0 +1,267 @@
+import os
+import runpy
+import sys
+import klayout.db as db
+from .AllPassRing import *
+from .AllPassEulerRing import *
+from .AllPassAdiabaticEulerRing import *
+from .GratingLidarNature import *
+from .GratingLidarAnsys import *
+from .LayoutDiff import *
+
+
+# Device layouts checked by the regression, built with the generator defaults
+REGRESSION_DEVICES = {
+    "circle_arc180_wg": lambda canvas: circle_arc180_wg(canvas, canvas.layer(1, 0), radius=10, width=0.45),
+    "euler_arc180_wg": lambda canvas: euler_arc180_wg(canvas, canvas.layer(1, 0), arc_length=50, width=0.45),
+    "racetrack_resonator": lambda canvas: racetrack_resonator(canvas, canvas.layer(1, 0), 100, 10, 0.45),
+    "euler_racetrack_resonator": lambda canvas: euler_racetrack_resonator(canvas, canvas.layer(1, 0), 100, 10, 0.45),
+    "adiabatic_euler_racetrack_resonator": lambda canvas: adiabatic_euler_racetrack_resonator(canvas, canvas.layer(1, 0)),
+    "all_pass_ring": lambda canvas: all_pass_ring(canvas, canvas.layer(1, 0)),
+    "all_pass_euler_ring": lambda canvas: all_pass_euler_ring(canvas, canvas.layer(1, 0)),
+    "all_pass_adiabatic_euler_ring": lambda canvas: all_pass_adiabatic_euler_ring(canvas, canvas.layer(1, 0)),
+    "grating_nature_lidar": lambda canvas: grating_nature_lidar(canvas, canvas.layer(10, 2), canvas.layer(11, 4)),
+    "grating_ansys_lidar": lambda canvas: grating_ansys_lidar(canvas, canvas.layer(10, 2), canvas.layer(11, 4)),
+}
+
+# Entry-point scripts (relative to src) and the layout file each of them writes (relative to the repository root)
+REGRESSION_ENTRY_POINTS = {
+    "main": ("main.py", "src/output/AllPassRing1.gds"),
+    "main1": ("main1.py", "src/output/AllPassRing1.gds"),
+    "main_grating_Ansys": ("main_grating_Ansys.py", "src/output/GratingAnsys1.gds"),
+    "main_grating_test": ("main_grating_test.py", "src/output/GratingNature1.gds"),
+}
+
+_SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_REPOSITORY_DIR = os.path.dirname(_SOURCE_DIR)
+
+
+def xor_area(
+        layout_a: db.Layout,
+        cell_a: db.Cell,
+        layer_a: int | None,
+        layout_b: db.Layout,
+        cell_b: db.Cell,
+        layer_b: int | None,
+        tolerance: float = 0.0,
+        threads: int = 4,
+        tile_size: float = 200.0,
+) -> float:
+    """Area of the XOR between one layer of two cells, computed tile by tile.
+
+    The XOR runs in klayout's `TilingProcessor` on the flattened cell
+    contents, distributed over several threads. Differences thinner than
+    twice the tolerance are removed by sizing the XOR down and up again.
+
+    Args:
+        layout_a: The layout of the first cell.
+        cell_a: The first cell.
+        layer_a: The layer index in `layout_a`, or None if the layer is missing.
+        layout_b: The layout of the second cell.
+        cell_b: The second cell.
+        layer_b: The layer index in `layout_b`, or None if the layer is missing.
+        tolerance: Differences up to this size are ignored (in microns).
+        threads: Number of threads used by the tiling processor.
+        tile_size: Edge length of the tiles (in microns).
+
+    Returns:
+        The differing area (in square microns).
+    """
+    difference = db.Region()
+
+    processor = db.TilingProcessor()
+    processor.dbu = layout_a.dbu
+    processor.threads = threads
+    processor.tile_size(tile_size, tile_size)
+    for name, layout, cell, layer in (("a", layout_a, cell_a, layer_a), ("b", layout_b, cell_b, layer_b)):
+        if layer is None:
+            processor.input(name, db.Region())
+        else:
+            processor.input(name, layout, cell.cell_index(), layer)
+    processor.output("o", difference)
+
+    tolerance_dbu = int(round(tolerance / layout_a.dbu))
+    if tolerance_dbu > 0:
+        processor.var("t", tolerance_dbu)
+        processor.queue("_output(o, (a ^ b).sized(-t).sized(t))")
+    else:
+        processor.queue("_output(o, a ^ b)")
+    processor.execute("XOR")
+
+    return difference.area() * layout_a.dbu ** 2
+
+def _local_xor_area(
+        cell_a: db.Cell,
+        layer_a: int | None,
+        cell_b: db.Cell,
+        layer_b: int | None,
+        tolerance_dbu: int,
+) -> float:
+    """XOR area (in database units squared) of the own shapes of two cells on one layer."""
+    region_a = db.Region() if layer_a is None else db.Region(cell_a.shapes(layer_a))
+    region_b = db.Region() if layer_b is None else db.Region(cell_b.shapes(layer_b))
+    difference = region_a ^ region_b
+    if tolerance_dbu > 0:
+        difference = difference.sized(-tolerance_dbu).sized(tolerance_dbu)
+    return difference.area()
+
+def compare_layouts(
+        layout_a: db.Layout,
+        layout_b: db.Layout,
+        tolerance: float = 0.0,
+        threads: int = 4,
+        tile_size: float = 200.0,
+        cells: list[str] = None,
+) -> list[dict]:
+    """Compare two layouts and attribute the differences to cells.
+
+    Cells are matched by name and layers by layer and datatype. The top
+    cells are compared once per layer with their hierarchy flattened, with
+    the tiled XOR of `xor_area`. Only if they differ, the differences are
+    attributed to cells: `cell_hashes` finds the cells whose own shapes
+    changed, and only their own shapes are XORed, without flattening.
+    Cells with moved, added or removed instances are reported as well.
+
+    Args:
+        layout_a: The reference (golden) layout.
+        layout_b: The layout to check.
+        tolerance: Differences up to this size are ignored (in microns).
+        threads: Number of threads used for the XOR.
+        tile_size: Edge length of the XOR tiles (in microns).
+        cells: Names of the cells compared flattened. Defaults to the top
+            cells of `layout_a`.
+
+    Returns:
+        A list of differences, each a dictionary with the keys "cell",
+        "layer" (e.g. "1/0", None if not layer specific), "status" and
+        "area" (differing area in square microns, None if not measured).
+        The status is "changed" (flattened difference of a compared cell),
+        "modified" (own shapes of a cell differ), "instances" (the instances
+        of a cell differ), "missing" or "added". An empty list means the
+        layouts are equal.
+    """
+    names_a = {cell.name for cell in layout_a.each_cell()}
+    names_b = {cell.name for cell in layout_b.each_cell()}
+
+    differences = [{"cell": name, "layer": None, "status": "missing", "area": None} for name in sorted(names_a - names_b)]
+    differences += [{"cell": name, "layer": None, "status": "added", "area": None} for name in sorted(names_b - names_a)]
+
+    layer_infos = {(info.layer, info.datatype) for info in layout_a.layer_infos()}
+    layer_infos |= {(info.layer, info.datatype) for info in layout_b.layer_infos()}
+    layers = [
+        (f"{layer}/{datatype}", layout_a.find_layer(layer, datatype), layout_b.find_layer(layer, datatype))
+        for layer, datatype in sorted(layer_infos)
+    ]
+
+    compared = [cell.name for cell in layout_a.top_cells()] if cells is None else list(cells)
+    for name in sorted(set(compared) & names_a & names_b):
+        for layer_name, layer_a, layer_b in layers:
+            area = xor_area(
+                layout_a, layout_a.cell(name), layer_a,
+                layout_b, layout_b.cell(name), layer_b,
+                tolerance=tolerance, threads=threads, tile_size=tile_size,
+            )
+            if area > 0:
+                differences.append({"cell": name, "layer": layer_name, "status": "changed", "area": area})
+
+    if not differences:
+        return differences
+
+    # Attribute the differences to the cells which changed themselves
+    changes = diff_layouts(layout_a, layout_b)
+    tolerance_dbu = int(round(tolerance / layout_a.dbu))
+    for name in changes["modified"]:
+        for layer_name, layer_a, layer_b in layers:
+            area = _local_xor_area(layout_a.cell(name), layer_a, layout_b.cell(name), layer_b, tolerance_dbu)
+            if area > 0:
+                differences.append({
+                    "cell": name, "layer": layer_name, "status": "modified", "area": area * layout_a.dbu ** 2,
+                })
+    children_a = {cell.cell_index(): cell.name for cell in layout_a.each_cell()}
+    children_b = {cell.cell_index(): cell.name for cell in layout_b.each_cell()}
+    for name in changes["modified"] + changes["affected"]:
+        if instance_keys(layout_a.cell(name), children_a) != instance_keys(layout_b.cell(name), children_b):
+            differences.append({"cell": name, "layer": None, "status": "instances", "area": None})
+
+    return differences
+
+def build_regression_layouts() -> dict[str, db.Layout]:
+    """Build the layouts of all regression devices and entry-point scripts.
+
+    The entry-point scripts are executed from the repository root, like
+    they are run by hand, and the layout they write is read back.
+
+    Returns:
+        A dictionary mapping the regression case name to its db.Layout.
+    """
+    layouts = {}
+    for name, build in REGRESSION_DEVICES.items():
+        canvas = db.Layout()
+        build(canvas)
+        layouts[name] = canvas
+
+    # The scripts import DeviceLibrary from src and write relative to the repository root
+    if _SOURCE_DIR not in sys.path:
+        sys.path.insert(0, _SOURCE_DIR)
+    working_dir = os.getcwd()
+    os.chdir(_REPOSITORY_DIR)
+    try:
+        for name, (script, output_path) in REGRESSION_ENTRY_POINTS.items():
+            runpy.run_path(os.path.join(_SOURCE_DIR, script), run_name="__main__")
+            canvas = db.Layout()
+            canvas.read(output_path)
+            layouts[name] = canvas
+    finally:
+        os.chdir(working_dir)
+
+    return layouts
+
+def run_regression(
+        golden_dir: str,
+        update: bool = False,
+        tolerance: float = 0.0,
+        threads: int = 4,
+        tile_size: float = 200.0,
+) -> dict[str, list[dict]]:
+    """Check all regression layouts against golden GDS files.
+
+    Args:
+        golden_dir: Directory holding one "<case>.gds" golden file per case.
+        update: Write the current layouts as new golden files instead of
+            comparing.
+        tolerance: Differences up to this size are ignored (in microns).
+        threads: Number of threads used for the XOR.
+        tile_size: Edge length of the XOR tiles (in microns).
+
+    Returns:
+        A dictionary mapping every case with differences (or without golden
+        file) to its list of differences, see `compare_layouts`.
+    """
+    os.makedirs(golden_dir, exist_ok=True)
+
+    failures = {}
+    for name, canvas in build_regression_layouts().items():
+        golden_path = os.path.join(golden_dir, f"{name}.gds")
+        if update:
+            canvas.write(golden_path)
+            print(f"{name}: golden file written")
+            continue
+
+        if not os.path.exists(golden_path):
+            failures[name] = [{"cell": None, "layer": None, "status": "missing golden", "area": None}]
+            print(f"{name}: no golden file {golden_path}")
+            continue
+
+        golden = db.Layout()
+        golden.read(golden_path)
+        differences = compare_layouts(golden, canvas, tolerance=tolerance, threads=threads, tile_size=tile_size)
+        if differences:
+            failures[name] = differences
+            print(f"{name}: FAILED")
+            for difference in differences:
+                area = "" if difference["area"] is None else f" {difference['area']:.6g} um^2"
+                print(f"    {difference['cell']} {difference['layer'] or ''} {difference['status']}{area}")
+        else:
+            print(f"{name}: ok")
+
+    return failures
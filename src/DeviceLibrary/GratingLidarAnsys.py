@@ -5,6 +5,7 @@ from .BasicCurve import *
 from .BasicComponents import *
 from .Resonator import *
 from .BasicOperator import *
+from .CellParameters import *
 
 
 def grating_ansys_lidar(
@@ -34,6 +35,9 @@ def grating_ansys_lidar(
     """
     # Create the top cell for the grating structure
     top_cell = canvas.create_cell("GRATING_ANSYS")
+    annotate_cell(top_cell, "grating_ansys_lidar", {
+        "width1": width1, "width2": width2, "height1": height1, "height2": height2, "num_pairs": num_pairs,
+    })
 
     # Iterate over the number of pairs to create the grating
     for pair_index in range(num_pairs):
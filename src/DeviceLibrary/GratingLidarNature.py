@@ -5,6 +5,9 @@ from .BasicCurve import *
 from .BasicComponents import *
 from .Resonator import *
 from .BasicOperator import *
+from .ShapeConversion import *
+from . import AffineTransform as at
+from .CellParameters import *
 
 def grating_nature_lidar(
     canvas: db.Layout,
@@ -51,6 +54,12 @@ def grating_nature_lidar(
 
     # Create a new cell for the grating structure
     top_cell = canvas.create_cell("GRATING_NATURE")
+    annotate_cell(top_cell, "grating_nature_lidar", {
+        "waveguide_width": waveguide_width, "transition_1_x": transition_1_x, "transition_1_y": transition_1_y,
+        "transition_1_radius": transition_1_radius, "pitch": pitch, "element_width": element_width,
+        "num_grating_elements": num_grating_elements, "arc_radii": list(arc_radii),
+        "grating_element_cladding": grating_element_cladding,
+    })
 
     # Create and insert the port waveguide
     port_length = 1.0
@@ -78,8 +87,9 @@ def grating_nature_lidar(
     curve_points.append(tuple(additional_p2))
    
 
-    # Create and insert the transition polygon
-    transition_polygon = db.Polygon([db.Point(*pt) for pt in curve_points])
+    # Create and insert the transition polygon, snapped to the database grid (coordinates in database units)
+    curve_points = clean_curve_points(curve_points, grid=1, name=f"{top_cell.name} transition")
+    transition_polygon = to_polygon(curve_points)
     top_cell.shapes(layer_full_etch).insert(transition_polygon)
 
     # Loop to create grating elements
@@ -92,16 +102,15 @@ def grating_nature_lidar(
 
         # Create arc for the grating element
         arc_points = create_arc(p1=arc_p1, p2=arc_p2, radius=radius, num_points=100)
-        # Add 1000 to the first element of each tuple in arc_points
-        
-        update_arc_points = [(x, y) for (x, y) in arc_points]
-        middle_ponit=find_middle_point(update_arc_points)
-        x_shift=middle_ponit[0]-update_arc_points[0][0]
-        new_arc_points = [(x+pitch*1000*(i+1)-x_shift+x_shift_1, y) for (x, y) in update_arc_points]
+        # Shift the arc so that its apex sits one pitch further than the previous element
+        middle_ponit=find_middle_point(arc_points)
+        x_shift=middle_ponit[0]-arc_points[0][0]
+        new_arc_points = at.apply_transform(at.translation(pitch*1000*(i+1)-x_shift+x_shift_1, 0), arc_points)
 
 
         # Create and insert the grating element
-        grating_element = db.Path(new_arc_points, width=element_width * 1000)
+        new_arc_points = clean_curve_points(new_arc_points, grid=1, name=f"{top_cell.name} element {i}")
+        grating_element = to_path(new_arc_points, width=element_width * 1000)
         top_cell.shapes(layer_full_etch).insert(grating_element)
 
         # Update current points for the next iteration
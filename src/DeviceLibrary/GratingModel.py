@@ -0,0 +1,174 @@
+import numpy as np
+
+
+def _dispersive_index(n_eff, n_g, wavelengths, center_wavelength):
+    """First-order effective index n_eff(lambda) from the index and group index at the center wavelength."""
+    n_eff = np.asarray(n_eff, dtype=float)
+    n_g = n_eff if n_g is None else np.asarray(n_g, dtype=float)
+    return n_eff + (n_eff - n_g) * (wavelengths - center_wavelength) / center_wavelength, n_g
+
+def grating_average_index(
+        wavelengths,
+        fill_factor,
+        n_eff1,
+        n_eff2,
+        n_g1=None,
+        n_g2=None,
+        center_wavelength: float = 1.55,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fill-factor weighted effective index and its derivative over the wavelength.
+
+    Args:
+        wavelengths: Wavelengths (in microns).
+        fill_factor: Fraction of the period taken by section 1.
+        n_eff1: Effective index of section 1 at `center_wavelength`.
+        n_eff2: Effective index of section 2 at `center_wavelength`.
+        n_g1: Group index of section 1. Defaults to `n_eff1` (no dispersion).
+        n_g2: Group index of section 2. Defaults to `n_eff2` (no dispersion).
+        center_wavelength: Wavelength at which the indices are given (in microns).
+
+    Returns:
+        A tuple (n_avg, dn_avg/dlambda) of broadcast arrays, the derivative
+        in 1/micron.
+    """
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    fill_factor = np.asarray(fill_factor, dtype=float)
+    index1, n_g1 = _dispersive_index(n_eff1, n_g1, wavelengths, center_wavelength)
+    index2, n_g2 = _dispersive_index(n_eff2, n_g2, wavelengths, center_wavelength)
+
+    n_avg = fill_factor * index1 + (1 - fill_factor) * index2
+    n_g_avg = fill_factor * n_g1 + (1 - fill_factor) * n_g2
+    n_avg_center = fill_factor * np.asarray(n_eff1, dtype=float) + (1 - fill_factor) * np.asarray(n_eff2, dtype=float)
+    return n_avg, (n_avg_center - n_g_avg) / center_wavelength
+
+def grating_emission_angle(
+        wavelengths,
+        period,
+        fill_factor,
+        n_eff1,
+        n_eff2,
+        n_g1=None,
+        n_g2=None,
+        n_clad: float = 1.0,
+        order: int = 1,
+        center_wavelength: float = 1.55,
+) -> np.ndarray:
+    """Emission angle of a grating coupler from the first-order grating equation.
+
+    The angle from the surface normal follows from phase matching,
+
+    .. math::
+
+        n_{clad} \\sin\\theta = n_{avg}(\\lambda) - m \\frac{\\lambda}{\\Lambda},
+
+    where the average index is the fill-factor weighted effective index of
+    the two grating sections. All arguments are broadcast against each
+    other, e.g. pass `wavelengths[:, None, None]`, `period[None, :, None]`
+    and `fill_factor[None, None, :]` to evaluate a full parameter grid.
+
+    Args:
+        wavelengths: Wavelengths (in microns).
+        period: Grating period (in microns), `width1 + width2` for
+            `grating_ansys_lidar` and `pitch` for `grating_nature_lidar`.
+        fill_factor: Fraction of the period taken by section 1, e.g.
+            `width1 / (width1 + width2)` or `element_width / pitch`.
+        n_eff1: Effective index of section 1 at `center_wavelength`.
+        n_eff2: Effective index of section 2 at `center_wavelength`.
+        n_g1: Group index of section 1. Defaults to `n_eff1` (no dispersion).
+        n_g2: Group index of section 2. Defaults to `n_eff2` (no dispersion).
+        n_clad: Refractive index of the medium the light is emitted into.
+        order: Diffraction order m.
+        center_wavelength: Wavelength at which the indices are given (in microns).
+
+    Returns:
+        An array of emission angles (in degrees, positive towards the
+        propagation direction). Orders which do not radiate are NaN.
+
+    Example:
+        .. code::
+
+            wavelengths = np.linspace(1.50, 1.60, 101)
+            angles = grating_emission_angle(wavelengths, period=0.66, fill_factor=0.5, n_eff1=2.8, n_eff2=2.2)
+    """
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    n_avg, _ = grating_average_index(wavelengths, fill_factor, n_eff1, n_eff2, n_g1, n_g2, center_wavelength)
+    sin_theta = (n_avg - order * wavelengths / np.asarray(period, dtype=float)) / n_clad
+    with np.errstate(invalid="ignore"):
+        return np.degrees(np.arcsin(np.where(np.abs(sin_theta) <= 1, sin_theta, np.nan)))
+
+def grating_steering_slope(
+        wavelengths,
+        period,
+        fill_factor,
+        n_eff1,
+        n_eff2,
+        n_g1=None,
+        n_g2=None,
+        n_clad: float = 1.0,
+        order: int = 1,
+        center_wavelength: float = 1.55,
+) -> np.ndarray:
+    """Wavelength steering slope d(theta)/d(lambda) of a grating coupler.
+
+    Differentiating the grating equation gives
+
+    .. math::
+
+        \\frac{d\\theta}{d\\lambda} = \\frac{dn_{avg}/d\\lambda - m/\\Lambda}{n_{clad} \\cos\\theta},
+
+    with :math:`dn_{avg}/d\\lambda = (n_{avg} - n_{g,avg}) / \\lambda_0`.
+    The arguments are broadcast like in `grating_emission_angle`.
+
+    Args:
+        wavelengths: Wavelengths (in microns).
+        period: Grating period (in microns).
+        fill_factor: Fraction of the period taken by section 1.
+        n_eff1: Effective index of section 1 at `center_wavelength`.
+        n_eff2: Effective index of section 2 at `center_wavelength`.
+        n_g1: Group index of section 1. Defaults to `n_eff1` (no dispersion).
+        n_g2: Group index of section 2. Defaults to `n_eff2` (no dispersion).
+        n_clad: Refractive index of the medium the light is emitted into.
+        order: Diffraction order m.
+        center_wavelength: Wavelength at which the indices are given (in microns).
+
+    Returns:
+        An array of steering slopes (in degrees per nm). Orders which do not
+        radiate are NaN.
+    """
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    angle = grating_emission_angle(
+        wavelengths, period, fill_factor, n_eff1, n_eff2, n_g1, n_g2, n_clad, order, center_wavelength
+    )
+    _, index_slope = grating_average_index(wavelengths, fill_factor, n_eff1, n_eff2, n_g1, n_g2, center_wavelength)
+    slope = (index_slope - order / np.asarray(period, dtype=float)) / (n_clad * np.cos(np.radians(angle)))
+    # rad/micron -> deg/nm
+    return np.degrees(slope) * 1e-3
+
+def grating_design_mask(
+        angles,
+        min_angle: float,
+        max_angle: float,
+        axis=None,
+) -> np.ndarray:
+    """Select grating designs whose emission angles stay inside a window.
+
+    Args:
+        angles: Emission angles from `grating_emission_angle` (in degrees).
+        min_angle: Lower bound of the allowed angles (in degrees).
+        max_angle: Upper bound of the allowed angles (in degrees).
+        axis: Axis (or axes) to require the condition over, e.g. the
+            wavelength axis. None evaluates every element on its own.
+
+    Returns:
+        A boolean array, True for designs to keep.
+
+    Example:
+        .. code::
+
+            keep = grating_design_mask(angles, min_angle=-20, max_angle=20, axis=0)
+            periods, fill_factors = period_grid[keep], fill_factor_grid[keep]
+    """
+    angles = np.asarray(angles, dtype=float)
+    with np.errstate(invalid="ignore"):
+        inside = (angles >= min_angle) & (angles <= max_angle)
+    return inside if axis is None else inside.all(axis=axis)
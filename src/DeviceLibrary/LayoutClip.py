@@ -0,0 +1,180 @@
+import os
+import re
+import concurrent.futures
+import klayout.db as db
+from .LayoutLoader import *
+from .CellParameters import *
+
+
+# Suffix klayout appends to the names of copied cells
+_CELL_COPY_SUFFIX = re.compile(r"\$\d+$")
+
+
+def clip_layout(
+        layout: db.Layout,
+        boxes: list[db.DBox],
+        cell: db.Cell = None,
+        target: db.Layout = None,
+) -> tuple[db.Layout, list[db.Cell]]:
+    """Clip several boxes out of a layout hierarchically.
+
+    All boxes are clipped in one `multi_clip_into` call. The clips keep the
+    hierarchy: cells lying completely inside a box are copied once and
+    shared between the clips, only cells crossing a box edge are cut. Copies
+    of annotated device cells which were not cut keep their generator
+    annotation (see `annotate_cell`), cut devices lose it.
+
+    Args:
+        layout: The layout to clip.
+        boxes: The clip boxes (in microns).
+        cell: The cell to clip. Defaults to the top cell of the layout.
+        target: The layout receiving the clips. Defaults to a new layout with
+            the same database unit. Its layers must use the layer indexes
+            of the source layout.
+
+    Returns:
+        A tuple (target, clip_cells) with one clip cell per box.
+
+    Raises:
+        ValueError: If no cell is given and the layout has several top cells.
+    """
+    if cell is None:
+        top_cells = layout.top_cells()
+        if len(top_cells) != 1:
+            raise ValueError(f"Expected one top cell, found {len(top_cells)}; pass the cell to clip.")
+        cell = top_cells[0]
+
+    if target is None:
+        target = db.Layout()
+        target.dbu = layout.dbu
+
+    # The clips use the layer indexes of the source layout
+    for layer_index in layout.layer_indexes():
+        if not target.is_valid_layer(layer_index):
+            target.insert_layer_at(layer_index, layout.get_info(layer_index))
+
+    # Cell index and integer boxes, the overload with cell references and micron boxes crashes in klayout 0.29
+    clip_boxes = [db.DBox(box).to_itype(layout.dbu) for box in boxes]
+    clip_indexes = layout.multi_clip_into(cell.cell_index(), target, clip_boxes)
+    _restore_annotations(layout, target)
+    return target, [target.cell(index) for index in clip_indexes]
+
+def _restore_annotations(
+        layout: db.Layout,
+        target: db.Layout,
+) -> None:
+    """Copy the annotations of uncut device cells to their clipped copies.
+
+    `multi_clip_into` drops all cell properties. A copy is found by its name,
+    with the "$<n>" suffixes of copies removed, and only annotated if its
+    geometry equals the source cell on every layer.
+    """
+    for target_cell in target.each_cell():
+        name = target_cell.name
+        while layout.cell(name) is None and _CELL_COPY_SUFFIX.search(name):
+            name = _CELL_COPY_SUFFIX.sub("", name)
+        source_cell = layout.cell(name)
+        if source_cell is None or cell_parameters(source_cell) is None:
+            continue
+        if source_cell.bbox() != target_cell.bbox():
+            continue
+        if all(
+            (db.Region(source_cell.begin_shapes_rec(layer_index))
+             ^ db.Region(target_cell.begin_shapes_rec(layer_index))).is_empty()
+            for layer_index in layout.layer_indexes()
+        ):
+            target_cell.set_property(PARAMETER_PROPERTY, source_cell.property(PARAMETER_PROPERTY))
+
+def _clip_names(
+        boxes: list[db.DBox],
+        names: list[str] = None,
+) -> list[str]:
+    """Output names of the clip boxes, "clip_<i>" by default."""
+    if names is None:
+        return [f"clip_{i}" for i in range(len(boxes))]
+    if len(names) != len(boxes):
+        raise ValueError("The number of clip names does not match the number of boxes.")
+    return list(names)
+
+def _clip_batch(
+        file_path: str,
+        boxes: list[tuple[float, float, float, float]],
+        names: list[str],
+        output_dir: str,
+        cell_name: str,
+        file_format: str,
+) -> list[str]:
+    # Runs in a worker process: read the layout once and write every clip of the batch
+    layout, _ = load_layout(file_path, verbose=False)
+    cell = None if cell_name is None else layout.cell(cell_name)
+    if cell_name is not None and cell is None:
+        raise ValueError(f"Cell '{cell_name}' not found in '{file_path}'.")
+
+    target, clip_cells = clip_layout(layout, [db.DBox(*box) for box in boxes], cell=cell)
+    output_paths = []
+    for name, clip_cell in zip(names, clip_cells):
+        clip_cell.name = name
+        output_path = os.path.join(output_dir, f"{name}.{file_format}")
+        options = annotation_save_options()
+        options.select_cell(clip_cell.cell_index())
+        target.write(output_path, options)
+        output_paths.append(output_path)
+    return output_paths
+
+def clip_to_files(
+        file_path: str,
+        boxes: list[db.DBox],
+        output_dir: str,
+        names: list[str] = None,
+        cell_name: str = None,
+        workers: int = 1,
+        file_format: str = "gds",
+) -> list[str]:
+    """Clip boxes out of a layout file and write each clip to its own file.
+
+    The boxes are split into one batch per worker process. Every worker
+    reads the layout once and clips its whole batch with `clip_layout`, so
+    reading is paid once per worker instead of once per box.
+
+    Args:
+        file_path: Path of the GDS/OASIS file to clip.
+        boxes: The clip boxes (in microns).
+        output_dir: Directory for the clip files, created if needed.
+        names: Optional names of the clips, used as cell and file names.
+            Defaults to "clip_<i>".
+        cell_name: The cell to clip. Defaults to the top cell.
+        workers: Number of worker processes.
+        file_format: The file suffix, "gds" or "oas".
+
+    Returns:
+        The paths of the written clip files, in the order of the boxes.
+
+    Example:
+        .. code::
+
+            clip_to_files("src/input/chip.gds", [db.DBox(0, 0, 500, 500), db.DBox(1000, 0, 1500, 500)],
+                          "src/output/clips", workers=2)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = _clip_names(boxes, names)
+    # Plain tuples, so the boxes can be sent to the worker processes
+    box_tuples = [(box.left, box.bottom, box.right, box.top) for box in map(db.DBox, boxes)]
+
+    workers = max(1, min(workers, len(boxes)))
+    batches = [(box_tuples[i::workers], names[i::workers]) for i in range(workers)]
+
+    if workers == 1:
+        results = [_clip_batch(file_path, box_tuples, names, output_dir, cell_name, file_format)]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_clip_batch, file_path, batch_boxes, batch_names, output_dir, cell_name, file_format)
+                for batch_boxes, batch_names in batches
+            ]
+            results = [future.result() for future in futures]
+
+    # Restore the order of the boxes from the interleaved batches
+    output_paths = [None] * len(boxes)
+    for i, batch_paths in enumerate(results):
+        output_paths[i::workers] = batch_paths
+    return output_paths
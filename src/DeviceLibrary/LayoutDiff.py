@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import klayout.db as db
+from .LayoutLoader import load_layout
+
+
+# Version of the stored hashes, files with another version are hashed again
+CELL_HASH_VERSION = 2
+CELL_HASH_SUFFIX = ".cellhash.json"
+
+
+def _layer_digest(
+        shapes: db.Shapes,
+) -> bytes:
+    """Digest of the geometry and texts of one layer of a cell.
+
+    The polygons are merged and formatted by klayout in one call. The merged
+    region is canonical, so the order of the shapes in the file and the
+    shape type (box, path or polygon) do not matter. Shape properties are
+    not compared.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    region = db.Region(shapes).merged()
+    digest.update(region.to_s(region.count()).encode())
+    texts = db.Texts(shapes)
+    if not texts.is_empty():
+        digest.update(b"\nTEXTS\n")
+        digest.update("\n".join(sorted(texts.to_s(texts.count()).split(";"))).encode())
+    return digest.digest()
+
+def instance_keys(
+        cell: db.Cell,
+        children: dict[int, str],
+) -> list[str]:
+    """Canonical texts of the instances of a cell, sorted.
+
+    Each text holds the child, its transformation, the array parameters and
+    the instance properties, so two cells have equal keys exactly if they
+    place the same children in the same way.
+
+    Args:
+        cell: The cell whose instances are described.
+        children: Text standing for each child cell by cell index, e.g. its
+            name or its content hash.
+
+    Returns:
+        The sorted instance texts.
+    """
+    keys = []
+    for instance in cell.each_inst():
+        cell_inst = instance.cell_inst
+        key = f"{children[cell_inst.cell_index]} {cell_inst.cplx_trans}"
+        if cell_inst.is_regular_array():
+            key += f" {cell_inst.a} {cell_inst.b} {cell_inst.na} {cell_inst.nb}"
+        if instance.has_prop_id():
+            key += f" {sorted(instance.properties().items(), key=str)}"
+        keys.append(key)
+    return sorted(keys)
+
+def cell_hashes(
+        layout: db.Layout,
+) -> dict[str, dict]:
+    """Content hashes of all cells, computed bottom-up.
+
+    The local hash covers the shapes of the cell on every layer (identified
+    by layer and datatype), see `_layer_digest`. The full hash additionally
+    covers the child instances with their transformations and array
+    parameters, where the child is represented by its own full hash. Two
+    cells with equal full hashes have identical subtrees, independent of
+    cell names and indexes. Every cell is hashed once, however often it is
+    instantiated.
+
+    Args:
+        layout: The layout to hash.
+
+    Returns:
+        A dictionary mapping the cell name to {"local": ..., "full": ...,
+        "children": sorted names of the child cells}. It is
+        JSON-serializable, see `file_cell_hashes`.
+    """
+    layers = sorted(
+        (layout.get_info(layer_index).layer, layout.get_info(layer_index).datatype, layer_index)
+        for layer_index in layout.layer_indexes()
+    )
+
+    full_hashes = {}
+    results = {}
+    for cell_index in layout.each_cell_bottom_up():
+        cell = layout.cell(cell_index)
+
+        local = hashlib.blake2b(digest_size=16)
+        for layer, datatype, layer_index in layers:
+            shapes = cell.shapes(layer_index)
+            if shapes.is_empty():
+                continue
+            local.update(f"L{layer}/{datatype}\n".encode())
+            local.update(_layer_digest(shapes))
+
+        full = local.copy()
+        full.update(b"\nINSTANCES\n")
+        full.update("\n".join(instance_keys(cell, full_hashes)).encode())
+
+        full_hashes[cell_index] = full.hexdigest()
+        results[cell.name] = {
+            "local": local.hexdigest(),
+            "full": full_hashes[cell_index],
+            "children": sorted(layout.cell(child).name for child in cell.each_child_cell()),
+        }
+    return results
+
+def file_cell_hashes(
+        file_path: str,
+        cache: bool = True,
+) -> dict[str, dict]:
+    """`cell_hashes` of a layout file, stored next to the file.
+
+    The hashes are written to "<file><CELL_HASH_SUFFIX>" together with the
+    size and modification time of the file. As long as the file does not
+    change, later calls read the stored hashes without loading the layout,
+    so an unchanged revision is hashed only once.
+
+    Args:
+        file_path: Path of the GDS/OASIS file.
+        cache: Read and write the stored hashes.
+
+    Returns:
+        The cell hashes, see `cell_hashes`.
+    """
+    status = os.stat(file_path)
+    stamp = {"version": CELL_HASH_VERSION, "size": status.st_size, "mtime_ns": status.st_mtime_ns}
+    cache_path = file_path + CELL_HASH_SUFFIX
+
+    if cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path) as file:
+                stored = json.load(file)
+            if stored.get("stamp") == stamp:
+                return stored["cells"]
+        except (OSError, ValueError):
+            pass
+
+    layout, _ = load_layout(file_path, verbose=False)
+    hashes = cell_hashes(layout)
+    if cache:
+        try:
+            with open(cache_path, "w") as file:
+                json.dump({"stamp": stamp, "cells": hashes}, file)
+        except OSError:
+            pass
+    return hashes
+
+def diff_layouts(
+        old_layout: db.Layout = None,
+        new_layout: db.Layout = None,
+        old_hashes: dict[str, dict] = None,
+        new_hashes: dict[str, dict] = None,
+) -> dict[str, list[str]]:
+    """Compare two revisions of a layout cell by cell.
+
+    Cells are matched by name. The new hierarchy is walked from its top
+    cells, and a subtree whose full hash equals the old one is skipped
+    entirely. Every other cell is either modified itself (its own shapes
+    differ) or affected through a changed child, which propagates changes
+    up to the top cells. With precomputed hashes, the layouts are not
+    needed at all.
+
+    Args:
+        old_layout: The previous revision, not needed with `old_hashes`.
+        new_layout: The new revision, not needed with `new_hashes`.
+        old_hashes: Optional precomputed `cell_hashes` of the old revision.
+        new_hashes: Optional precomputed `cell_hashes` of the new revision.
+
+    Returns:
+        A dictionary of sorted cell name lists with the keys "added",
+        "removed", "modified" (own shapes changed), "affected" (only the
+        instances or the content of a child changed) and "unchanged"
+        (roots of skipped identical subtrees).
+
+    Example:
+        .. code::
+
+            changes = diff_layouts(
+                old_hashes=file_cell_hashes("src/input/chip_v2.gds"),
+                new_hashes=file_cell_hashes("src/input/chip_v3.gds"),
+            )
+            print(changes["modified"], changes["affected"])
+    """
+    old_hashes = cell_hashes(old_layout) if old_hashes is None else old_hashes
+    new_hashes = cell_hashes(new_layout) if new_hashes is None else new_hashes
+
+    result = {
+        "added": sorted(set(new_hashes) - set(old_hashes)),
+        "removed": sorted(set(old_hashes) - set(new_hashes)),
+        "modified": [],
+        "affected": [],
+        "unchanged": [],
+    }
+
+    called = {child for cell in new_hashes.values() for child in cell["children"]}
+    visited = set()
+    pending = [name for name in new_hashes if name not in called]
+    while pending:
+        name = pending.pop()
+        if name in visited:
+            continue
+        visited.add(name)
+
+        old = old_hashes.get(name)
+        new = new_hashes[name]
+        if old is not None:
+            if old["full"] == new["full"]:
+                result["unchanged"].append(name)
+                continue
+            result["modified" if old["local"] != new["local"] else "affected"].append(name)
+        pending.extend(new["children"])
+
+    for key in ("modified", "affected", "unchanged"):
+        result[key].sort()
+    return result
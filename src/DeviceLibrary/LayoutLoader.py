@@ -0,0 +1,202 @@
+import os
+import time
+import concurrent.futures
+import klayout.db as db
+
+
+LOAD_MODES = ("full", "layers", "hierarchy")
+
+
+def _resident_memory() -> int | None:
+    """Return the resident memory of the current process in bytes, or None if unknown."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, AttributeError, ValueError):
+        return None
+
+def load_options(
+        mode: str = "full",
+        layers: list[tuple[int, int]] = None,
+) -> db.LoadLayoutOptions:
+    """Create load options for a full, layer-filtered or hierarchy-only read.
+
+    Args:
+        mode: One of "full" (read everything), "layers" (read only the given
+            layers) or "hierarchy" (read cells and instances but no shapes).
+        layers: List of (layer, datatype) tuples to read in "layers" mode.
+
+    Returns:
+        A db.LoadLayoutOptions object to pass to `db.Layout.read`.
+
+    Raises:
+        ValueError: If the mode is unknown or "layers" mode is used without
+            layers.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode '{mode}', expected one of {LOAD_MODES}.")
+
+    options = db.LoadLayoutOptions()
+    if mode == "full":
+        return options
+
+    if mode == "layers" and not layers:
+        raise ValueError("The 'layers' load mode requires a list of (layer, datatype) tuples.")
+
+    # An explicit layer map without "create other layers" makes the reader skip
+    # the shapes of all unmapped layers. An empty map skips all shapes.
+    layer_map = db.LayerMap()
+    if mode == "layers":
+        for target_index, (layer, datatype) in enumerate(layers):
+            layer_map.map(db.LayerInfo(layer, datatype), target_index)
+    options.layer_map = layer_map
+    options.create_other_layers = False
+    options.text_enabled = mode == "layers"
+    options.properties_enabled = mode == "layers"
+
+    return options
+
+def keep_cells(
+        layout: db.Layout,
+        cell_names: list[str],
+) -> int:
+    """Delete every cell which is not one of the given cells or below them.
+
+    Args:
+        layout: The layout object to prune.
+        cell_names: Names of the cells whose subtrees are kept.
+
+    Returns:
+        The number of deleted cells.
+
+    Raises:
+        ValueError: If a name matches no cell. Nothing is deleted then.
+    """
+    missing = [name for name in cell_names if layout.cell(name) is None]
+    if missing:
+        raise ValueError(f"Cells not found: {', '.join(repr(name) for name in missing)}.")
+
+    kept = set()
+    for name in cell_names:
+        cell = layout.cell(name)
+        kept.add(cell.cell_index())
+        kept.update(cell.called_cells())
+
+    removed = [cell.cell_index() for cell in layout.each_cell() if cell.cell_index() not in kept]
+    layout.delete_cells(removed)
+    return len(removed)
+
+def load_layout(
+        file_path: str,
+        mode: str = "full",
+        layers: list[tuple[int, int]] = None,
+        cells: list[str] = None,
+        verbose: bool = True,
+) -> tuple[db.Layout, dict]:
+    """Load a layout file in full, layer-filtered or hierarchy-only mode.
+
+    Layer filtering and hierarchy-only loading are done by the reader, so the
+    skipped shapes are never created. Cell filtering is applied right after
+    reading and releases the memory of all cells outside the selected
+    subtrees.
+
+    Args:
+        file_path: Path of the GDS/OASIS file to read.
+        mode: One of "full", "layers" or "hierarchy" (see `load_options`).
+        layers: List of (layer, datatype) tuples to read in "layers" mode.
+        cells: Optional list of cell names whose subtrees are kept.
+        verbose: Print the load statistics.
+
+    Returns:
+        A tuple (layout, stats) where stats is a dictionary with the keys
+        "mode", "load_time" (seconds), "memory" (resident memory increase in
+        bytes, None if it cannot be measured), "file_size", "cells" and
+        "layers".
+
+    Raises:
+        ValueError: If one of `cells` is not in the file.
+
+    Example:
+        .. code::
+
+            layout, stats = load_layout("src/input/chip.gds", mode="hierarchy")
+    """
+    options = load_options(mode=mode, layers=layers)
+
+    memory_before = _resident_memory()
+    start_time = time.perf_counter()
+
+    layout = db.Layout()
+    layout.read(file_path, options)
+    if cells:
+        keep_cells(layout, cells)
+
+    load_time = time.perf_counter() - start_time
+    memory_after = _resident_memory()
+
+    stats = {
+        "mode": mode,
+        "load_time": load_time,
+        "memory": None if memory_before is None else memory_after - memory_before,
+        "file_size": os.path.getsize(file_path),
+        "cells": sum(1 for _ in layout.each_cell()),
+        "layers": layout.layers(),
+    }
+
+    if verbose:
+        memory = "unknown" if stats["memory"] is None else f"{stats['memory'] / 1e6:.1f} MB"
+        print(f"Loaded '{file_path}' ({mode}) in {load_time:.2f} s, "
+              f"{stats['cells']} cells, {stats['layers']} layers, memory {memory}")
+
+    return layout, stats
+
+def _load_stats(file_path, mode, layers, cells):
+    # Runs in a worker process so that every mode starts from a clean heap
+    return load_layout(file_path, mode=mode, layers=layers, cells=cells, verbose=False)[1]
+
+def compare_load_modes(
+        file_path: str,
+        modes: tuple[str, ...] = LOAD_MODES,
+        layers: list[tuple[int, int]] = None,
+        cells: list[str] = None,
+) -> list[dict]:
+    """Measure load time and memory of several load modes against a full read.
+
+    Every mode is loaded in a separate process, so the memory figures do not
+    influence each other.
+
+    Args:
+        file_path: Path of the GDS/OASIS file to read.
+        modes: The load modes to compare. "full" is always measured as the
+            reference.
+        layers: List of (layer, datatype) tuples for "layers" mode.
+        cells: Optional list of cell names whose subtrees are kept.
+
+    Returns:
+        A list of statistics dictionaries as returned by `load_layout`, each
+        extended by "time_saved" and "memory_saved" relative to the full read.
+    """
+    modes = ("full",) + tuple(mode for mode in modes if mode != "full")
+
+    results = []
+    for mode in modes:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+            results.append(executor.submit(_load_stats, file_path, mode, layers, cells).result())
+
+    reference = results[0]
+    for stats in results:
+        stats["time_saved"] = reference["load_time"] - stats["load_time"]
+        if reference["memory"] is None or stats["memory"] is None:
+            stats["memory_saved"] = None
+        else:
+            stats["memory_saved"] = reference["memory"] - stats["memory"]
+        memory_saved = "unknown" if stats["memory_saved"] is None else f"{stats['memory_saved'] / 1e6:.1f} MB"
+        print(f"{stats['mode']:>9}: {stats['load_time']:.2f} s, "
+              f"saved {stats['time_saved']:.2f} s and {memory_saved}")
+
+    return results
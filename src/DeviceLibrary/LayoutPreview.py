@@ -0,0 +1,205 @@
+import os
+import struct
+import zlib
+import concurrent.futures
+import klayout.db as db
+import numpy as np
+from .ColumnarExport import *
+
+
+# Fill colors (RGB) of the layers in the order they are rendered
+PREVIEW_COLORS = [
+    (31, 119, 180), (255, 127, 14), (44, 160, 44), (214, 39, 40),
+    (148, 103, 189), (140, 86, 75), (227, 119, 194), (127, 127, 127),
+]
+
+
+def rasterize_polygons(
+        vertices: np.ndarray,
+        offsets: np.ndarray,
+        origin: tuple[float, float],
+        pixel_size: float,
+        shape: tuple[int, int],
+) -> np.ndarray:
+    """Fill polygons into a boolean pixel mask with a vectorized scanline pass.
+
+    Every polygon edge is intersected with the centers of all pixel rows it
+    crosses in one array operation. Each crossing adds the edge direction
+    (+1 up, -1 down) at the first pixel right of it, and a cumulative sum
+    along the rows gives the winding number of every pixel center. Pixels
+    with a non-zero winding number are filled, so overlapping polygons and
+    cut lines of resolved holes need no merging. No crossings are sorted.
+
+    Args:
+        vertices: (N, 2) array of the hull vertices of all polygons.
+        offsets: (P + 1,) array, polygon i spans vertices[offsets[i]:offsets[i + 1]].
+        origin: The (x, y) coordinate of the top left image corner.
+        pixel_size: Edge length of a pixel in the units of the vertices.
+        shape: The image shape (rows, columns).
+
+    Returns:
+        A boolean array of the given shape, True where the pixel center is
+        covered.
+    """
+    rows, columns = shape
+    if len(vertices) == 0:
+        return np.zeros(shape, dtype=bool)
+
+    # The end of every edge is the next vertex of the same polygon
+    next_index = np.arange(1, len(vertices) + 1)
+    next_index[offsets[1:] - 1] = offsets[:-1]
+
+    # Pixel coordinates, with the rows counting downwards from the top
+    x = (vertices[:, 0] - origin[0]) / pixel_size
+    y = (origin[1] - vertices[:, 1]) / pixel_size
+    x0, y0, x1, y1 = x, y, x[next_index], y[next_index]
+
+    # Rows whose center r + 0.5 lies in [min(y0, y1), max(y0, y1))
+    first_row = np.maximum(np.ceil(np.minimum(y0, y1) - 0.5), 0).astype(np.int64)
+    last_row = np.minimum(np.ceil(np.maximum(y0, y1) - 0.5) - 1, rows - 1).astype(np.int64)
+    counts = np.maximum(last_row - first_row + 1, 0)
+
+    edge = np.repeat(np.arange(len(vertices)), counts)
+    row = first_row[edge] + np.arange(edge.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    center = row + 0.5
+    crossing = x0[edge] + (center - y0[edge]) * (x1[edge] - x0[edge]) / (y1[edge] - y0[edge])
+    column = np.clip(np.ceil(crossing - 0.5), 0, columns).astype(np.int64)
+    # Downwards in pixel rows is upwards in the layout
+    direction = np.where(y1[edge] < y0[edge], 1.0, -1.0)
+
+    winding = np.bincount(row * (columns + 1) + column, weights=direction, minlength=rows * (columns + 1))
+    winding = np.cumsum(winding.reshape(rows, columns + 1), axis=1)
+    return np.abs(winding[:, :columns]) > 0.5
+
+def render_cell(
+        canvas: db.Layout,
+        cell: db.Cell,
+        layers: list[int],
+        size: int = 256,
+        bbox: db.DBox = None,
+        colors: list[tuple[int, int, int]] = None,
+        alpha: float = 0.7,
+) -> np.ndarray:
+    """Render the flattened layers of a cell into an RGB image.
+
+    Args:
+        canvas: The layout containing the cell.
+        cell: The cell to render.
+        layers: The layer indexes to render, later layers are drawn on top.
+        size: Number of pixels along the longer side of the rendered area.
+        bbox: The rendered area (in microns). Defaults to the bounding box
+            of the cell.
+        colors: Fill color (RGB) of each layer. Defaults to `PREVIEW_COLORS`.
+        alpha: Opacity of the layer fills on the white background.
+
+    Returns:
+        A (rows, columns, 3) uint8 array.
+    """
+    colors = PREVIEW_COLORS if colors is None else colors
+    bbox = cell.dbbox() if bbox is None else bbox
+    box = db.DBox(bbox).to_itype(canvas.dbu)
+
+    pixel_size = max(box.width(), box.height(), 1) / size
+    shape = (max(1, round(box.height() / pixel_size)), max(1, round(box.width() / pixel_size)))
+    image = np.full(shape + (3,), 255.0)
+    for i, layer_index in enumerate(layers):
+        region = db.Region(cell.begin_shapes_rec_overlapping(layer_index, box)) & db.Region(box)
+        vertices, offsets = polygon_vertices(region)
+        mask = rasterize_polygons(vertices, offsets, (box.left, box.top), pixel_size, shape)
+        image[mask] = image[mask] * (1 - alpha) + np.array(colors[i % len(colors)]) * alpha
+    return np.round(image).astype(np.uint8)
+
+def write_png(
+        file_path: str,
+        image: np.ndarray,
+) -> None:
+    """Write an RGB (rows, columns, 3) or grayscale (rows, columns) uint8 image as PNG."""
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    color_type = 2 if image.ndim == 3 else 0
+
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+    # Every row starts with filter type 0 (none)
+    rows = image.reshape(image.shape[0], -1)
+    raw = np.hstack((np.zeros((rows.shape[0], 1), dtype=np.uint8), rows)).tobytes()
+    with open(file_path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", image.shape[1], image.shape[0], 8, color_type, 0, 0, 0)))
+        file.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+        file.write(chunk(b"IEND", b""))
+
+def contact_sheet(
+        images: list[np.ndarray],
+        columns: int = 8,
+        padding: int = 4,
+) -> np.ndarray:
+    """Arrange RGB images row by row on a gray sheet, each centered in an equal slot."""
+    slot_height = max(image.shape[0] for image in images) + padding
+    slot_width = max(image.shape[1] for image in images) + padding
+    columns = max(1, min(columns, len(images)))
+    num_rows = -(-len(images) // columns)
+
+    sheet = np.full((num_rows * slot_height + padding, columns * slot_width + padding, 3), 200, dtype=np.uint8)
+    for i, image in enumerate(images):
+        top = (i // columns) * slot_height + padding + (slot_height - padding - image.shape[0]) // 2
+        left = (i % columns) * slot_width + padding + (slot_width - padding - image.shape[1]) // 2
+        sheet[top:top + image.shape[0], left:left + image.shape[1]] = image
+    return sheet
+
+def render_thumbnails(
+        canvas: db.Layout,
+        cells: list[db.Cell],
+        layers: list[int],
+        output_dir: str = None,
+        sheet_path: str = None,
+        size: int = 128,
+        columns: int = 8,
+        threads: int = 4,
+) -> dict:
+    """Render PNG thumbnails of many cells, e.g. the variants of a sweep.
+
+    The cells are rendered by a thread pool with `render_cell`. The NumPy
+    scanline filling runs in parallel across the cells, the geometry is
+    collected from klayout one cell at a time.
+
+    Args:
+        canvas: The layout containing the cells.
+        cells: The cells to render.
+        layers: The layer indexes to render.
+        output_dir: Directory for one "<cell name>.png" per cell, created if
+            needed. None writes no single thumbnails.
+        sheet_path: Path of a PNG contact sheet with all thumbnails in the
+            order of the cells. None writes no sheet.
+        size: Number of pixels along the longer side of each thumbnail.
+        columns: Number of thumbnails per row of the contact sheet.
+        threads: Number of rendering threads.
+
+    Returns:
+        A dictionary with the keys "images" (cell name -> RGB array),
+        "files" (the written thumbnail paths) and "sheet" (the contact
+        sheet array, None without cells).
+
+    Example:
+        .. code::
+
+            cells = match_cell_names(layout, "ALL_PASS_RING*")
+            render_thumbnails(layout, cells, [layout.layer(1, 0)], sheet_path="src/output/rings.png")
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        rendered = list(executor.map(lambda cell: render_cell(canvas, cell, layers, size=size), cells))
+    images = {cell.name: image for cell, image in zip(cells, rendered)}
+
+    files = []
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        for name, image in images.items():
+            file_path = os.path.join(output_dir, f"{name}.png")
+            write_png(file_path, image)
+            files.append(file_path)
+
+    sheet = contact_sheet(rendered, columns=columns) if rendered else None
+    if sheet_path is not None and sheet is not None:
+        write_png(sheet_path, sheet)
+
+    return {"images": images, "files": files, "sheet": sheet}
@@ -0,0 +1,136 @@
+import fnmatch
+import re
+import klayout.db as db
+
+
+def build_parent_index(
+        layout: db.Layout,
+) -> dict[int, list[tuple[int, db.CellInstArray]]]:
+    """Build a cell-to-parent index of a layout.
+
+    The index maps every cell index to the instance arrays that place it,
+    together with the index of the parent cell holding each array. It is
+    built once from `each_parent_inst` and can be reused for any number of
+    queries on the same layout.
+
+    Args:
+        layout: The layout object to index.
+
+    Returns:
+        A dictionary mapping a cell index to a list of
+        (parent_cell_index, db.CellInstArray) tuples. Top cells map to an
+        empty list.
+
+    Example:
+        .. code::
+
+            parent_index = build_parent_index(layout)
+            pad_parents = parent_index[layout.cell("BP_M1M2_80_60").cell_index()]
+    """
+    parent_index = {}
+    for cell in layout.each_cell():
+        parent_index[cell.cell_index()] = [
+            (parent_inst.parent_cell_index(), parent_inst.child_inst().cell_inst)
+            for parent_inst in cell.each_parent_inst()
+        ]
+    return parent_index
+
+def match_cell_names(
+        layout: db.Layout,
+        pattern: str,
+        use_regex: bool = False,
+) -> list[db.Cell]:
+    """Find the cells of a layout whose names match a pattern.
+
+    Args:
+        layout: The layout object to search.
+        pattern: A glob pattern (e.g. "BP_M1M2_*") or, if `use_regex` is
+            set, a regular expression which must match the full cell name.
+        use_regex: Interpret `pattern` as a regular expression.
+
+    Returns:
+        A list of db.Cell objects with matching names.
+    """
+    if use_regex:
+        regex = re.compile(pattern)
+    else:
+        regex = re.compile(fnmatch.translate(pattern))
+    return [cell for cell in layout.each_cell() if regex.fullmatch(cell.name)]
+
+def find_cell_placements(
+        layout: db.Layout,
+        pattern: str,
+        top_cell: db.Cell = None,
+        parent_index: dict[int, list[tuple[int, db.CellInstArray]]] = None,
+        use_regex: bool = False,
+) -> list[dict]:
+    """Find all placements of the cells matching a name pattern.
+
+    Instead of walking down the whole hierarchy, the search walks up from
+    every matching cell through the parent index. The absolute
+    transformations of each visited parent are memoized, so shared subcells
+    are resolved only once and the work is proportional to the number of
+    placements found. Array instances are expanded into their individual
+    placements.
+
+    Args:
+        layout: The layout object to search.
+        pattern: A glob pattern or regular expression for the cell names.
+        top_cell: The cell the placements are reported relative to. Defaults
+            to the layout's top cell.
+        parent_index: An index from `build_parent_index`. It is built on the
+            fly if not given.
+        use_regex: Interpret `pattern` as a regular expression.
+
+    Returns:
+        A list of dictionaries, one per placement, with the keys
+        "cell" (cell name), "trans" (absolute db.DCplxTrans in microns) and
+        "bbox" (absolute db.DBox in microns).
+
+    Raises:
+        ValueError: If no top cell is given and the layout has none or
+            several top cells.
+
+    Example:
+        .. code::
+
+            for placement in find_cell_placements(layout, "BP_M1M2_*"):
+                print(placement["cell"], placement["trans"], placement["bbox"])
+    """
+    if top_cell is None:
+        top_cells = list(layout.each_top_cell())
+        if len(top_cells) != 1:
+            raise ValueError("The layout has no unique top cell, please specify top_cell.")
+        top_cell = layout.cell(top_cells[0])
+
+    if parent_index is None:
+        parent_index = build_parent_index(layout)
+
+    top_index = top_cell.cell_index()
+    absolute_trans = {top_index: [db.ICplxTrans()]}
+
+    def placements_of(cell_index):
+        # Absolute transformations of a cell, resolved bottom-up and memoized
+        if cell_index not in absolute_trans:
+            trans_list = []
+            for parent_cell_index, cell_inst in parent_index[cell_index]:
+                parent_trans = placements_of(parent_cell_index)
+                if not parent_trans:
+                    continue
+                for inst_trans in cell_inst.each_cplx_trans():
+                    trans_list.extend(trans * inst_trans for trans in parent_trans)
+            absolute_trans[cell_index] = trans_list
+        return absolute_trans[cell_index]
+
+    dbu_trans = db.CplxTrans(layout.dbu)
+    placements = []
+    for cell in match_cell_names(layout, pattern, use_regex=use_regex):
+        cell_bbox = cell.bbox()
+        for trans in placements_of(cell.cell_index()):
+            placements.append({
+                "cell": cell.name,
+                "trans": dbu_trans * trans * dbu_trans.inverted(),
+                "bbox": (dbu_trans * trans) * cell_bbox,
+            })
+
+    return placements
@@ -0,0 +1,182 @@
+import csv
+import json
+import os
+import concurrent.futures
+import klayout.db as db
+from .LayoutLoader import *
+
+
+def _layer_counts(
+        layout: db.Layout,
+        layer_index: int,
+) -> dict[str, tuple[int, int]]:
+    """Shape and vertex count of every cell on one layer, without its children."""
+    counts = {}
+    for cell in layout.each_cell():
+        shapes = cell.shapes(layer_index)
+        if shapes.is_empty():
+            continue
+        vertices = 0
+        for shape in shapes.each():
+            if shape.is_box():
+                vertices += 4
+            elif shape.is_polygon() or shape.is_simple_polygon() or shape.is_path():
+                vertices += shape.polygon.num_points()
+        counts[cell.name] = (shapes.size(), vertices)
+    return counts
+
+def _layer_group_counts(
+        file_path: str,
+        layers: list[tuple[int, int]],
+) -> dict[str, dict[str, tuple[int, int]]]:
+    # Runs in a worker process: read only the shapes of this group of layers
+    layout, _ = load_layout(file_path, mode="layers", layers=layers, verbose=False)
+    return {
+        f"{layer}/{datatype}": _layer_counts(layout, layout.find_layer(layer, datatype))
+        for layer, datatype in layers
+    }
+
+def _hierarchy_stats(
+        layout: db.Layout,
+) -> dict[str, dict]:
+    """Instance count, placement count and depth of every cell."""
+    placements = {cell.cell_index(): 0 for cell in layout.each_cell()}
+    for top_cell in layout.top_cells():
+        placements[top_cell.cell_index()] = 1
+    # Every parent is complete before its children, so placements multiply down the hierarchy
+    for cell_index in layout.each_cell_top_down():
+        for instance in layout.cell(cell_index).each_inst():
+            cell_inst = instance.cell_inst
+            placements[cell_inst.cell_index] += placements[cell_index] * cell_inst.size()
+
+    depths = {}
+    for cell_index in layout.each_cell_bottom_up():
+        depths[cell_index] = 1 + max((depths[child] for child in layout.cell(cell_index).each_child_cell()), default=-1)
+
+    return {
+        layout.cell(cell_index).name: {
+            "instances": layout.cell(cell_index).child_instances(),
+            "placements": placements[cell_index],
+            "depth": depths[cell_index],
+        }
+        for cell_index in placements
+    }
+
+def layout_stats(
+        file_path: str,
+        layers: list[tuple[int, int]] = None,
+        workers: int = None,
+) -> dict:
+    """Shape, vertex and hierarchy statistics of a layout file.
+
+    Shapes and vertices are counted once per cell and multiplied by the
+    number of placements of the cell, so the flattened size is known
+    without flattening. With a list of layers, the hierarchy is read without
+    shapes and the layers are split into groups, one per worker process,
+    which each read and count only their own layers. Without a list of
+    layers, the file is read once in full and counted serially in this
+    process, because the layers of a file are only known after reading its
+    shapes; pass the layers for a parallel scan.
+
+    Args:
+        file_path: Path of the GDS/OASIS file.
+        layers: Optional list of (layer, datatype) tuples to count.
+        workers: Number of worker processes when layers are given, defaults
+            to the number of CPUs.
+
+    Returns:
+        A dictionary with the keys:
+            "file": the file path,
+            "top_cells": names of the top cells,
+            "depth": the hierarchy depth (0 for a flat layout),
+            "totals": {"cells", "shapes", "vertices", "flat_shapes", "flat_vertices"},
+            "layers": per "layer/datatype" the same counts as in "totals",
+            "cells": per cell name "instances", "placements", "depth" and
+                "layers" ("layer/datatype" -> {"shapes", "vertices"}).
+
+    Example:
+        .. code::
+
+            stats = layout_stats("src/input/chip.gds", layers=[(1, 0), (2, 0)], workers=2)
+            print(stats["totals"]["flat_vertices"])
+    """
+    if layers:
+        layout, _ = load_layout(file_path, mode="hierarchy", verbose=False)
+        layers = [tuple(layer) for layer in layers]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(layers)))
+        groups = [layers[i::workers] for i in range(workers)]
+        if workers == 1:
+            layer_counts = _layer_group_counts(file_path, layers)
+        else:
+            layer_counts = {}
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(_layer_group_counts, [file_path] * workers, groups):
+                    layer_counts.update(result)
+        layer_counts = {f"{layer}/{datatype}": layer_counts[f"{layer}/{datatype}"] for layer, datatype in layers}
+    else:
+        layout, _ = load_layout(file_path, verbose=False)
+        layer_counts = {}
+        for layer_index in sorted(layout.layer_indexes(), key=lambda index: (layout.get_info(index).layer, layout.get_info(index).datatype)):
+            info = layout.get_info(layer_index)
+            layer_counts[f"{info.layer}/{info.datatype}"] = _layer_counts(layout, layer_index)
+
+    cells = _hierarchy_stats(layout)
+    for cell_stats in cells.values():
+        cell_stats["layers"] = {}
+
+    totals = {"cells": len(cells), "shapes": 0, "vertices": 0, "flat_shapes": 0, "flat_vertices": 0}
+    layer_totals = {}
+    for layer_name, counts in layer_counts.items():
+        layer_total = {"shapes": 0, "vertices": 0, "flat_shapes": 0, "flat_vertices": 0}
+        for cell_name, (shapes, vertices) in counts.items():
+            placements = cells[cell_name]["placements"]
+            cells[cell_name]["layers"][layer_name] = {"shapes": shapes, "vertices": vertices}
+            layer_total["shapes"] += shapes
+            layer_total["vertices"] += vertices
+            layer_total["flat_shapes"] += shapes * placements
+            layer_total["flat_vertices"] += vertices * placements
+        layer_totals[layer_name] = layer_total
+        for key, value in layer_total.items():
+            totals[key] += value
+
+    top_cells = [cell.name for cell in layout.top_cells()]
+    return {
+        "file": file_path,
+        "top_cells": top_cells,
+        "depth": max((cells[name]["depth"] for name in top_cells), default=0),
+        "totals": totals,
+        "layers": layer_totals,
+        "cells": cells,
+    }
+
+def write_stats_json(
+        stats: dict,
+        file_path: str,
+) -> None:
+    """Write the result of `layout_stats` as a JSON report."""
+    with open(file_path, "w") as file:
+        json.dump(stats, file, indent=2)
+
+def write_stats_csv(
+        stats: dict,
+        file_path: str,
+) -> None:
+    """Write the result of `layout_stats` as a CSV table with one row per cell and layer.
+
+    Cells without shapes get a single row with an empty layer, so the
+    hierarchy columns are complete.
+    """
+    columns = ["cell", "layer", "instances", "placements", "depth", "shapes", "vertices", "flat_shapes", "flat_vertices"]
+    with open(file_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for cell_name, cell_stats in sorted(stats["cells"].items()):
+            hierarchy = [cell_stats["instances"], cell_stats["placements"], cell_stats["depth"]]
+            if not cell_stats["layers"]:
+                writer.writerow([cell_name, ""] + hierarchy + [0, 0, 0, 0])
+            for layer_name, counts in cell_stats["layers"].items():
+                placements = cell_stats["placements"]
+                writer.writerow([cell_name, layer_name] + hierarchy + [
+                    counts["shapes"], counts["vertices"],
+                    counts["shapes"] * placements, counts["vertices"] * placements,
+                ])
@@ -0,0 +1,147 @@
+import os
+import klayout.db as db
+from .CellParameters import *
+
+
+# Cell properties which mark a ghost cell as a reference into a library file
+LIBRARY_FILE_PROPERTY = "oeds_library_file"
+LIBRARY_CELL_PROPERTY = "oeds_library_cell"
+
+# Registered libraries by absolute file path, with the file modification time they were read at
+_LIBRARY_CACHE: dict[str, tuple[float, db.Library]] = {}
+
+
+def register_gds_library(
+        file_path: str,
+        library_name: str = None,
+) -> db.Library:
+    """Read a GDS/OASIS file into a klayout library, once per process.
+
+    The library is cached by file path and read again only if the file has
+    changed, so repeated jobs (e.g. in the generation daemon) share it.
+
+    Args:
+        file_path: Path of the library file, e.g. a foundry PDK GDS.
+        library_name: Name under which the library is registered. Defaults
+            to the file name without suffix.
+
+    Returns:
+        The registered db.Library.
+    """
+    file_path = os.path.abspath(file_path)
+    modification_time = os.path.getmtime(file_path)
+    cached = _LIBRARY_CACHE.get(file_path)
+    if cached is not None and cached[0] == modification_time:
+        return cached[1]
+
+    library = db.Library()
+    library.description = file_path
+    library.layout().read(file_path)
+    library.register(library_name or os.path.splitext(os.path.basename(file_path))[0])
+    _LIBRARY_CACHE[file_path] = (modification_time, library)
+    return library
+
+def library_reference(
+        canvas: db.Layout,
+        file_path: str,
+        cell_name: str,
+) -> db.Cell:
+    """Create a placeholder for a cell of an external library file.
+
+    The placeholder is an empty ghost cell named like the library cell,
+    which records the library file and cell name in its properties. It can
+    be placed like any other cell. The library file is not read until the
+    references are resolved with `resolve_library_references`.
+
+    Args:
+        canvas: The layout where the reference is placed.
+        file_path: Path of the library GDS/OASIS file.
+        cell_name: Name of the cell in the library.
+
+    Returns:
+        The ghost db.Cell. Repeated calls for the same library cell return
+        the same cell.
+
+    Example:
+        .. code::
+
+            pad = library_reference(layout, "src/input/pdk.gds", "BP_M1M2_80_60")
+            top_cell.insert(db.DCellInstArray(pad.cell_index(), db.DTrans(db.DVector(500, 0))))
+    """
+    file_path = os.path.abspath(file_path)
+    for cell in canvas.each_cell():
+        if (cell.is_ghost_cell() and cell.property(LIBRARY_FILE_PROPERTY) == file_path
+                and cell.property(LIBRARY_CELL_PROPERTY) == cell_name):
+            return cell
+
+    reference = canvas.create_cell(cell_name)
+    reference.ghost_cell = True
+    reference.set_property(LIBRARY_FILE_PROPERTY, file_path)
+    reference.set_property(LIBRARY_CELL_PROPERTY, cell_name)
+    return reference
+
+def resolve_library_references(
+        canvas: db.Layout,
+) -> int:
+    """Replace the library placeholders of a layout by library proxy cells.
+
+    Every referenced library file is registered with `register_gds_library`
+    and each placeholder is replaced by a proxy cell of the library, which
+    klayout fills with the library geometry. The instances of the
+    placeholder are moved to the proxy and the placeholder is deleted.
+
+    Args:
+        canvas: The layout to resolve in place.
+
+    Returns:
+        The number of resolved library cells.
+
+    Raises:
+        ValueError: If a referenced cell does not exist in its library.
+    """
+    references = [
+        cell for cell in canvas.each_cell()
+        if cell.is_ghost_cell() and cell.property(LIBRARY_FILE_PROPERTY) is not None
+    ]
+    for reference in references:
+        file_path = reference.property(LIBRARY_FILE_PROPERTY)
+        cell_name = reference.property(LIBRARY_CELL_PROPERTY)
+        library = register_gds_library(file_path)
+        if library.layout().cell(cell_name) is None:
+            raise ValueError(f"Cell '{cell_name}' not found in library '{file_path}'.")
+
+        # Free the name, so that the proxy gets the name of the library cell
+        reference.name = f"{cell_name}$REFERENCE"
+        proxy = canvas.create_cell(cell_name, library.name())
+
+        for instance in [parent.child_inst() for parent in reference.each_parent_inst()]:
+            cell_inst = instance.cell_inst
+            cell_inst.cell_index = proxy.cell_index()
+            instance.cell_inst = cell_inst
+        canvas.delete_cell(reference.cell_index())
+
+    return len(references)
+
+def write_with_library_references(
+        canvas: db.Layout,
+        file_path: str,
+        resolve: bool = True,
+) -> int:
+    """Write a layout containing library placeholders.
+
+    The generator annotations of the cells are written as well, see
+    `annotation_save_options`.
+
+    Args:
+        canvas: The layout to write.
+        file_path: The output file.
+        resolve: Resolve the placeholders into library geometry before
+            writing. Without resolving, the file only references the library
+            cells by name, for flows that merge the foundry cells later.
+
+    Returns:
+        The number of resolved library cells, 0 without resolving.
+    """
+    resolved = resolve_library_references(canvas) if resolve else 0
+    canvas.write(file_path, annotation_save_options())
+    return resolved
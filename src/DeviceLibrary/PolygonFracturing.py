@@ -0,0 +1,141 @@
+import klayout.db as db
+from .CellParameters import *
+
+
+# Largest number of vertices of a GDSII BOUNDARY, 8191 points including the closing point
+GDS_MAX_VERTEX_COUNT = 8190
+
+
+def _needs_fracturing(
+        shape: db.Shape,
+        max_vertex_count: int,
+) -> bool:
+    """Check whether a polygon or path shape has more vertices than allowed."""
+    if shape.is_path():
+        path = shape.path
+        return path.num_points() > max_vertex_count or path.polygon().num_points() > max_vertex_count
+    return shape.polygon.num_points() > max_vertex_count
+
+def fracture_polygon(
+        polygon: db.Polygon,
+        max_vertex_count: int = GDS_MAX_VERTEX_COUNT,
+) -> list[db.Polygon]:
+    """Split a polygon into abutting pieces with at most `max_vertex_count` vertices.
+
+    Args:
+        polygon: The polygon (db.Polygon or db.Path) to fracture.
+        max_vertex_count: The vertex limit of each piece.
+
+    Returns:
+        A list of db.Polygon pieces, the polygon itself if it is within the limit.
+    """
+    if isinstance(polygon, db.Path):
+        polygon = polygon.polygon()
+    if polygon.num_points() <= max_vertex_count:
+        return [polygon]
+    return list(polygon.break_(max_vertex_count, 0))
+
+def fracture_shapes(
+        shapes: db.Shapes,
+        max_vertex_count: int = GDS_MAX_VERTEX_COUNT,
+) -> tuple[int, int]:
+    """Fracture the polygons and paths of a shape container in place.
+
+    All shapes above the vertex limit are collected into one db.Region and
+    broken in a single call, paths are converted to polygons first. Shapes
+    within the limit are left untouched.
+
+    Args:
+        shapes: The shape container, e.g. `cell.shapes(layer)`.
+        max_vertex_count: The vertex limit of each piece.
+
+    Returns:
+        A tuple (fractured_shapes, pieces) with the number of shapes that
+        were replaced and the number of pieces inserted for them.
+    """
+    oversized = [
+        shape for shape in shapes.each(db.Shapes.SPolygons | db.Shapes.SPaths)
+        if _needs_fracturing(shape, max_vertex_count)
+    ]
+    if not oversized:
+        return 0, 0
+
+    region = db.Region()
+    for shape in oversized:
+        region.insert(shape.polygon)
+        shapes.erase(shape)
+
+    # Merged semantics would join abutting or overlapping input polygons again
+    region.merged_semantics = False
+    pieces = region.break_(max_vertex_count, 0)
+    shapes.insert(pieces)
+    return len(oversized), pieces.count()
+
+def fracture_layout(
+        canvas: db.Layout,
+        max_vertex_count: int = GDS_MAX_VERTEX_COUNT,
+) -> dict[str, int]:
+    """Fracture every polygon and path above a vertex limit in a whole layout.
+
+    Run this before writing a layout, so that the file only contains
+    boundaries that every GDSII reader accepts and downstream fracture tools
+    do not have to split them unpredictably. Each cell is processed once,
+    so shared cells stay shared. The GDSII writer splits polygons above its
+    own limit of 8000 vertices by default, so write the result with
+    `write_fractured` or with the same `gds2_max_vertex_count`.
+
+    Args:
+        canvas: The layout to fracture in place.
+        max_vertex_count: The vertex limit of each piece, defaults to the
+            GDSII limit.
+
+    Returns:
+        A dictionary with the keys "cells" (number of cells changed),
+        "fractured_shapes" and "pieces".
+
+    Example:
+        .. code::
+
+            stats = write_fractured(layout, "src/output/AllPassRing1.gds", max_vertex_count=1000)
+
+            # Or with own save options
+            stats = fracture_layout(layout, max_vertex_count=1000)
+            options = db.SaveLayoutOptions()
+            options.gds2_max_vertex_count = 1000
+            layout.write("src/output/AllPassRing1.gds", options)
+    """
+    stats = {"cells": 0, "fractured_shapes": 0, "pieces": 0}
+    for cell in canvas.each_cell():
+        changed = False
+        for layer in canvas.layer_indexes():
+            fractured_shapes, pieces = fracture_shapes(cell.shapes(layer), max_vertex_count)
+            if fractured_shapes:
+                changed = True
+                stats["fractured_shapes"] += fractured_shapes
+                stats["pieces"] += pieces
+        stats["cells"] += changed
+    return stats
+
+def write_fractured(
+        canvas: db.Layout,
+        file_path: str,
+        max_vertex_count: int = GDS_MAX_VERTEX_COUNT,
+) -> dict[str, int]:
+    """Fracture a layout with `fracture_layout` and write it.
+
+    The GDSII writer is configured with the same vertex limit, so nothing is
+    split again while writing.
+
+    Args:
+        canvas: The layout to fracture and write.
+        file_path: The output file, the format follows the suffix.
+        max_vertex_count: The vertex limit of each piece.
+
+    Returns:
+        The statistics of `fracture_layout`.
+    """
+    stats = fracture_layout(canvas, max_vertex_count)
+    options = annotation_save_options()
+    options.gds2_max_vertex_count = max_vertex_count
+    canvas.write(file_path, options)
+    return stats
@@ -3,6 +3,9 @@ import math
 import numpy as np
 from .BasicCurve import *
 from .BasicComponents import *
+from .ShapeConversion import *
+from .BasicOperator import *
+from .CellParameters import *
 
 
 def racetrack_resonator(
@@ -30,6 +33,9 @@ def racetrack_resonator(
     """
     # Create a new cell for the racetrack resonator
     resonator_cell = canvas.create_cell("RACETRACK_RESONATOR")
+    annotate_cell(resonator_cell, "racetrack_resonator", {
+        "radius": radius, "straight_length": straight_length, "width": width,
+    })
 
     # Create the top and bottom straight sections of the racetrack
     straight_wg_top = straight_wg(canvas, layer, straight_length, width)
@@ -85,6 +91,9 @@ def euler_racetrack_resonator(
     """
     # Create a new cell for the Euler racetrack resonator
     resonator_cell = canvas.create_cell("EULER_RACETRACK")
+    annotate_cell(resonator_cell, "euler_racetrack_resonator", {
+        "arc_length": arc_length, "straight_length": straight_length, "width": width,
+    })
 
     # Compute parameters for Euler bends
     s = arc_length / 2
@@ -92,7 +101,7 @@ def euler_racetrack_resonator(
     L = np.sqrt(np.pi / alpha)  # Constant ℓ
 
     # Compute Fresnel integrals to calculate X and Y coordinates
-    fresnel_sin, fresnel_cos = fresnel(1)
+    fresnel_sin, fresnel_cos = fresnel(1, backend="series")
     x_coords = L * fresnel_cos  # C(s/ℓ)
     y_coords = L * fresnel_sin  # S(s/ℓ)
 
@@ -129,6 +138,7 @@ def adiabatic_euler_racetrack_resonator(
         num_points: int = 2000,
         arc_length1: float = 20,
         arc_length2: float = 17,
+        fresnel_backend: str = "scipy",
 ) -> db.Cell:
     """
     Creates an adiabatic Euler racetrack resonator in a layout cell.
@@ -141,6 +151,7 @@ def adiabatic_euler_racetrack_resonator(
         num_points: Number of points to use for generating the Euler curves.
         arc_length1: Length of outter arc (in microns).
         arc_length2: Length of inner arc (in microns).
+        fresnel_backend: The backend of the Fresnel integrals, see `fresnel`.
 
     Returns:
         A db.Cell object containing the adiabatic Euler racetrack resonator.
@@ -154,6 +165,10 @@ def adiabatic_euler_racetrack_resonator(
     """
     # Create a top-level cell for the adiabatic Euler ruler ring
     top_cell = canvas.create_cell("ADIABATIC_EULER_RING")
+    annotate_cell(top_cell, "adiabatic_euler_racetrack_resonator", {
+        "width": width, "straight_length": straight_length, "num_points": num_points,
+        "arc_length1": arc_length1, "arc_length2": arc_length2,
+    })
     arc_length1=arc_length1*1000
     arc_length2=arc_length2*1000
     width=width*1000
@@ -166,14 +181,18 @@ def adiabatic_euler_racetrack_resonator(
     alpha1, alpha2 = np.pi / (s1 ** 2), np.pi / (s2 ** 2)
 
     # Generate points for the two Euler arcs
-    curve_points1 = euler_arc180_curve(s=s1, alpha=alpha1, num_points=num_points, x_bias=0, y_bias=0)
-    curve_points2 = euler_arc180_curve(s=s2, alpha=alpha2, num_points=num_points, x_bias=0, y_bias=width)
+    curve_points1 = euler_arc180_curve(s=s1, alpha=alpha1, num_points=num_points, x_bias=0, y_bias=0, fresnel_backend=fresnel_backend)
+    curve_points2 = euler_arc180_curve(s=s2, alpha=alpha2, num_points=num_points, x_bias=0, y_bias=width, fresnel_backend=fresnel_backend)
+
+    # Snap to the database grid and remove redundant vertices, the coordinates are in database units
+    curve_points1 = clean_curve_points(curve_points1, grid=1, name=f"{top_cell.name} outer arc")
+    curve_points2 = clean_curve_points(curve_points2, grid=1, name=f"{top_cell.name} inner arc")
 
     # Combine the two sets of curve points
     full_curve_points = np.vstack((curve_points1, curve_points2[::-1]))
 
     # Create polygon from combined curve points
-    polygon = db.Polygon([db.Point(*pt) for pt in full_curve_points])
+    polygon = to_polygon(full_curve_points)
 
     # Create the region and insert the polygon
     region = db.Region()
@@ -0,0 +1,238 @@
+import numpy as np
+
+
+def all_pass_ring_length(
+        radius,
+        straight_length,
+) -> np.ndarray:
+    """Round-trip length of the racetrack used by `all_pass_ring`.
+
+    Args:
+        radius: Radius of the 180-degree circular bends (in microns). Scalar
+            or array, one value per device.
+        straight_length: Length of the straight sections (in microns).
+
+    Returns:
+        An array of round-trip lengths (in microns).
+    """
+    return 2 * np.pi * np.asarray(radius, dtype=float) + 2 * np.asarray(straight_length, dtype=float)
+
+def all_pass_euler_ring_length(
+        arc_length,
+        straight_length,
+) -> np.ndarray:
+    """Round-trip length of the racetrack used by `all_pass_euler_ring`.
+
+    Args:
+        arc_length: Arc length of each 180-degree Euler bend (in microns).
+            Scalar or array, one value per device.
+        straight_length: Length of the straight sections (in microns).
+
+    Returns:
+        An array of round-trip lengths (in microns).
+    """
+    return 2 * np.asarray(arc_length, dtype=float) + 2 * np.asarray(straight_length, dtype=float)
+
+def all_pass_adiabatic_euler_ring_length(
+        arc_length1,
+        arc_length2,
+        straight_length,
+) -> np.ndarray:
+    """Round-trip length of the racetrack used by `all_pass_adiabatic_euler_ring`.
+
+    The bends of the adiabatic racetrack are bounded by an outer Euler arc of
+    `arc_length1` and an inner Euler arc of `arc_length2`, the mode is assumed
+    to follow the mean of both.
+
+    Args:
+        arc_length1: Length of the outer arc (in microns). Scalar or array,
+            one value per device.
+        arc_length2: Length of the inner arc (in microns).
+        straight_length: Length of the straight sections (in microns).
+
+    Returns:
+        An array of round-trip lengths (in microns).
+    """
+    arc_length1 = np.asarray(arc_length1, dtype=float)
+    arc_length2 = np.asarray(arc_length2, dtype=float)
+    return arc_length1 + arc_length2 + 2 * np.asarray(straight_length, dtype=float)
+
+def round_trip_amplitude(
+        round_trip_length,
+        loss_db_per_cm,
+) -> np.ndarray:
+    """Field amplitude transmission `a` of one round trip.
+
+    Args:
+        round_trip_length: Round-trip length (in microns).
+        loss_db_per_cm: Propagation loss of the waveguide (in dB/cm).
+
+    Returns:
+        An array of round-trip amplitude transmissions (0 < a <= 1).
+    """
+    loss_db = np.asarray(loss_db_per_cm, dtype=float) * np.asarray(round_trip_length, dtype=float) * 1e-4
+    return 10 ** (-loss_db / 20)
+
+def nearest_resonance_wavelength(
+        wavelength,
+        round_trip_length,
+        n_eff,
+        n_g=None,
+) -> np.ndarray:
+    """Resonance wavelength closest to a given wavelength.
+
+    The resonance order is m = round(n_eff * L / wavelength), and the
+    resonance is located with the first-order dispersion of the effective
+    index given by the group index.
+
+    Args:
+        wavelength: Wavelength near which the resonance is searched, and at
+            which `n_eff` and `n_g` are given (in microns).
+        round_trip_length: Round-trip lengths of the devices (in microns).
+        n_eff: Effective index, scalar or one per device.
+        n_g: Group index, scalar or one per device. Defaults to `n_eff`.
+
+    Returns:
+        An array of resonance wavelengths (in microns).
+    """
+    wavelength = np.asarray(wavelength, dtype=float)
+    round_trip_length = np.asarray(round_trip_length, dtype=float)
+    n_eff = np.asarray(n_eff, dtype=float)
+    n_g = n_eff if n_g is None else np.asarray(n_g, dtype=float)
+
+    phase_order = n_eff * round_trip_length / wavelength
+    order = np.maximum(np.round(phase_order), 1)
+    return wavelength + (phase_order - order) * wavelength ** 2 / (n_g * round_trip_length)
+
+def all_pass_transmission(
+        wavelengths,
+        round_trip_length,
+        n_eff,
+        n_g=None,
+        center_wavelength: float = 1.55,
+        loss_db_per_cm=3.0,
+        self_coupling=0.95,
+        chunk_size: int = 256,
+        dtype=np.float64,
+) -> np.ndarray:
+    """Through-port power transmission of all-pass rings.
+
+    The transmission is evaluated for every combination of device and
+    wavelength,
+
+    .. math::
+
+        T = \\frac{a^2 - 2 a t \\cos\\phi + t^2}{1 - 2 a t \\cos\\phi + a^2 t^2},
+        \\qquad \\phi = \\frac{2 \\pi n_{eff}(\\lambda) L}{\\lambda},
+
+    where the effective index is extrapolated to first order with the group
+    index, :math:`n_{eff}(\\lambda) = n_{eff} + (n_{eff} - n_g)(\\lambda - \\lambda_0)/\\lambda_0`.
+    The devices are processed in chunks, so the temporaries stay small even
+    for 10^4 devices x 10^4 wavelengths.
+
+    Args:
+        wavelengths: Array of K wavelengths (in microns).
+        round_trip_length: Round-trip lengths of M devices (in microns), e.g.
+            from `all_pass_euler_ring_length`.
+        n_eff: Effective index at `center_wavelength`, scalar or one per device.
+        n_g: Group index, scalar or one per device. Defaults to `n_eff`
+            (no dispersion).
+        center_wavelength: Wavelength at which `n_eff` and `n_g` are given
+            (in microns).
+        loss_db_per_cm: Propagation loss (in dB/cm), scalar or one per device.
+        self_coupling: Self-coupling coefficient `t` of the bus coupler,
+            scalar or one per device.
+        chunk_size: Number of devices processed at once.
+        dtype: Data type of the returned array, np.float32 halves the memory.
+
+    Returns:
+        An (M, K) array of through-port power transmissions.
+
+    Example:
+        .. code::
+
+            lengths = all_pass_euler_ring_length(arc_length=np.linspace(50, 150, 10000), straight_length=10)
+            wavelengths = np.linspace(1.50, 1.60, 10000)
+            transmission = all_pass_transmission(wavelengths, lengths, n_eff=2.4, n_g=4.2, dtype=np.float32)
+    """
+    wavelengths = np.asarray(wavelengths, dtype=float).ravel()
+    round_trip_length = np.atleast_1d(np.asarray(round_trip_length, dtype=float)).ravel()
+    num_devices = round_trip_length.size
+
+    def per_device(value):
+        return np.broadcast_to(np.asarray(value, dtype=float), (num_devices,))
+
+    n_eff = per_device(n_eff)
+    n_g = n_eff if n_g is None else per_device(n_g)
+    a = per_device(round_trip_amplitude(round_trip_length, per_device(loss_db_per_cm)))
+    t = per_device(self_coupling)
+
+    # Relative wavelength offsets and inverse wavelengths are shared by all devices
+    relative_offset = (wavelengths - center_wavelength) / center_wavelength
+    inverse_wavelength = 2 * np.pi / wavelengths
+
+    transmission = np.empty((num_devices, wavelengths.size), dtype=dtype)
+    for start in range(0, num_devices, chunk_size):
+        chunk = slice(start, min(start + chunk_size, num_devices))
+        n_eff_chunk = n_eff[chunk, None] + (n_eff[chunk, None] - n_g[chunk, None]) * relative_offset
+        phase = n_eff_chunk * round_trip_length[chunk, None] * inverse_wavelength
+
+        at = (a[chunk] * t[chunk])[:, None]
+        two_at_cos = 2 * at * np.cos(phase)
+        numerator = (a[chunk] ** 2 + t[chunk] ** 2)[:, None] - two_at_cos
+        denominator = 1 + at ** 2 - two_at_cos
+        transmission[chunk] = numerator / denominator
+
+    return transmission
+
+def all_pass_ring_metrics(
+        round_trip_length,
+        n_g,
+        center_wavelength: float = 1.55,
+        loss_db_per_cm=3.0,
+        self_coupling=0.95,
+) -> dict[str, np.ndarray]:
+    """Free spectral range, extinction and loaded Q of all-pass rings.
+
+    Args:
+        round_trip_length: Round-trip lengths of the devices (in microns).
+        n_g: Group index, scalar or one per device.
+        center_wavelength: Wavelength at which the metrics are evaluated
+            (in microns).
+        loss_db_per_cm: Propagation loss (in dB/cm), scalar or one per device.
+        self_coupling: Self-coupling coefficient `t` of the bus coupler,
+            scalar or one per device.
+
+    Returns:
+        A dictionary of arrays with the keys "fsr" (in microns),
+        "extinction_ratio_db", "min_transmission" (on resonance),
+        "max_transmission" (off resonance), "loaded_q" and "finesse".
+
+    Example:
+        .. code::
+
+            metrics = all_pass_ring_metrics(all_pass_ring_length(radius=100, straight_length=10), n_g=4.2)
+            print(metrics["fsr"], metrics["loaded_q"])
+    """
+    round_trip_length = np.asarray(round_trip_length, dtype=float)
+    n_g = np.asarray(n_g, dtype=float)
+    a = round_trip_amplitude(round_trip_length, loss_db_per_cm)
+    t = np.asarray(self_coupling, dtype=float)
+    at = a * t
+
+    fsr = center_wavelength ** 2 / (n_g * round_trip_length)
+    min_transmission = (a - t) ** 2 / (1 - at) ** 2
+    max_transmission = (a + t) ** 2 / (1 + at) ** 2
+    with np.errstate(divide="ignore"):
+        extinction_ratio_db = 10 * np.log10(max_transmission / min_transmission)
+    loaded_q = np.pi * n_g * round_trip_length * np.sqrt(at) / (center_wavelength * (1 - at))
+    finesse = np.pi * np.sqrt(at) / (1 - at)
+
+    return {
+        "fsr": fsr,
+        "extinction_ratio_db": extinction_ratio_db,
+        "min_transmission": min_transmission,
+        "max_transmission": max_transmission,
+        "loaded_q": loaded_q,
+        "finesse": finesse,
+    }
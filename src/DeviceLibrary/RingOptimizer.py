@@ -0,0 +1,206 @@
+import functools
+import klayout.db as db
+import numpy as np
+from .AllPassEulerRing import *
+from .RingModel import *
+
+
+# Fresnel integrals at the end of each Euler half bend, s / l = 1
+_FRESNEL_SIN_1, _FRESNEL_COS_1 = fresnel(1, backend="series")
+
+
+def all_pass_euler_ring_geometry(
+        arc_length: float,
+        straight_length: float,
+        waveguide_width: float = 0.45,
+        gap: float = 0.2,
+) -> tuple[float, float, float]:
+    """Analytic round-trip length and bounding box of `all_pass_euler_ring`.
+
+    The values are derived from the same construction as the generator,
+    without creating any geometry. The evaluation takes a few arithmetic
+    operations, so it is not cached: the continuous candidates of the
+    optimizer practically never repeat.
+
+    Args:
+        arc_length: The arc length of the 180-degree Euler bend (in microns).
+        straight_length: The length of the straight sections (in microns).
+        waveguide_width: The width of the waveguide (in microns).
+        gap: The gap between the racetrack and the bus waveguide (in microns).
+
+    Returns:
+        A tuple (round_trip_length, bbox_width, bbox_height) in microns.
+    """
+    # With alpha = pi / s^2 the Euler constant l equals s = arc_length / 2
+    s = arc_length / 2
+    x_extent = s * float(_FRESNEL_COS_1)
+    y_extent = s * float(_FRESNEL_SIN_1)
+
+    round_trip_length = float(all_pass_euler_ring_length(arc_length, straight_length))
+    bbox_width = straight_length + 2 * x_extent + waveguide_width
+    bbox_height = 2 * y_extent + gap + 2 * waveguide_width
+    return round_trip_length, bbox_width, bbox_height
+
+def _euler_ring_cost(
+        parameters,
+        waveguide_width,
+        gap,
+        n_eff,
+        n_g,
+        center_wavelength,
+        target_fsr,
+        target_resonance,
+        max_footprint,
+        objective,
+):
+    """Cost of one candidate (arc_length, straight_length) of `optimize_all_pass_euler_ring`."""
+    arc_length, straight_length = (round(float(value), 6) for value in parameters)
+    round_trip_length, bbox_width, bbox_height = all_pass_euler_ring_geometry(
+        arc_length, straight_length, waveguide_width, gap
+    )
+    fsr = center_wavelength ** 2 / (n_g * round_trip_length)
+
+    cost = 0.0
+    if target_fsr is not None:
+        cost += ((fsr - target_fsr) / target_fsr) ** 2
+    if target_resonance is not None:
+        resonance = nearest_resonance_wavelength(target_resonance, round_trip_length, n_eff, n_g)
+        cost += ((resonance - target_resonance) / fsr) ** 2
+    if max_footprint is not None:
+        excess_width = max(bbox_width - max_footprint[0], 0) / max_footprint[0]
+        excess_height = max(bbox_height - max_footprint[1], 0) / max_footprint[1]
+        cost += 1e3 * (excess_width ** 2 + excess_height ** 2)
+    if objective is not None:
+        cost += objective({
+            "arc_length": arc_length,
+            "straight_length": straight_length,
+            "round_trip_length": round_trip_length,
+            "bbox_width": bbox_width,
+            "bbox_height": bbox_height,
+            "fsr": fsr,
+        })
+    return float(cost)
+
+def optimize_all_pass_euler_ring(
+        n_eff: float,
+        n_g: float,
+        target_fsr: float = None,
+        target_resonance: float = None,
+        max_footprint: tuple[float, float] = None,
+        objective=None,
+        arc_length_bounds: tuple[float, float] = (10.0, 200.0),
+        straight_length_bounds: tuple[float, float] = (0.0, 100.0),
+        waveguide_width: float = 0.45,
+        gap: float = 0.2,
+        center_wavelength: float = 1.55,
+        workers: int = 1,
+        seed: int = None,
+        canvas: db.Layout = None,
+        layer: int = None,
+) -> dict:
+    """Search the `all_pass_euler_ring` parameters that meet spectral targets.
+
+    `arc_length` and `straight_length` are optimized with
+    `scipy.optimize.differential_evolution`. Every candidate is evaluated
+    with the analytic geometry of `all_pass_euler_ring_geometry`
+    and the ring model, so no geometry is drawn during the search. With
+    `workers` > 1 the candidates of each generation are evaluated in
+    parallel processes. The chosen design is generated once at the end if
+    a canvas is given.
+
+    Args:
+        n_eff: Effective index at `center_wavelength`.
+        n_g: Group index at `center_wavelength`.
+        target_fsr: Target free spectral range (in microns).
+        target_resonance: Target resonance wavelength (in microns).
+        max_footprint: Maximum (width, height) of the ring including the bus
+            waveguide (in microns).
+        objective: Optional user objective, a picklable callable which takes
+            a dictionary with the keys "arc_length", "straight_length",
+            "round_trip_length", "bbox_width", "bbox_height" and "fsr" and
+            returns a cost added to the built-in terms.
+        arc_length_bounds: Search range of `arc_length` (in microns).
+        straight_length_bounds: Search range of `straight_length` (in microns).
+        waveguide_width: The width of the waveguide (in microns).
+        gap: The gap between the racetrack and the bus waveguide (in microns).
+        center_wavelength: Wavelength at which the indices are given (in microns).
+        workers: Number of parallel processes, -1 uses all CPUs.
+        seed: Seed of the optimizer for reproducible results.
+        canvas: If given, the chosen design is generated in this layout.
+        layer: The layer index for the generated design.
+
+    Returns:
+        A dictionary with the keys "arc_length", "straight_length",
+        "round_trip_length", "fsr", "resonance_wavelength" (nearest to
+        `target_resonance` or `center_wavelength`), "bbox" (width, height),
+        "cost", "result" (the scipy OptimizeResult) and "cell" (the generated
+        db.Cell or None).
+
+    Raises:
+        ValueError: If no target, footprint limit or objective is given.
+
+    Example:
+        .. code::
+
+            design = optimize_all_pass_euler_ring(
+                n_eff=2.4, n_g=4.2, target_fsr=0.005, target_resonance=1.55,
+                max_footprint=(80, 60), workers=4, canvas=layout, layer=layer_index,
+            )
+    """
+    if target_fsr is None and target_resonance is None and max_footprint is None and objective is None:
+        raise ValueError("At least one of target_fsr, target_resonance, max_footprint or objective is required.")
+
+    from scipy.optimize import differential_evolution
+
+    cost_function = functools.partial(
+        _euler_ring_cost,
+        waveguide_width=waveguide_width,
+        gap=gap,
+        n_eff=n_eff,
+        n_g=n_g,
+        center_wavelength=center_wavelength,
+        target_fsr=target_fsr,
+        target_resonance=target_resonance,
+        max_footprint=max_footprint,
+        objective=objective,
+    )
+    result = differential_evolution(
+        cost_function,
+        bounds=[arc_length_bounds, straight_length_bounds],
+        workers=workers,
+        updating="immediate" if workers == 1 else "deferred",
+        seed=seed,
+        tol=1e-10,
+    )
+
+    arc_length, straight_length = (round(float(value), 6) for value in result.x)
+    round_trip_length, bbox_width, bbox_height = all_pass_euler_ring_geometry(
+        arc_length, straight_length, waveguide_width, gap
+    )
+    resonance_wavelength = nearest_resonance_wavelength(
+        center_wavelength if target_resonance is None else target_resonance, round_trip_length, n_eff, n_g
+    )
+
+    # Generate the chosen design only once
+    cell = None
+    if canvas is not None:
+        cell = all_pass_euler_ring(
+            canvas=canvas,
+            layer=layer,
+            waveguide_width=waveguide_width,
+            arc_length=arc_length,
+            straight_length=straight_length,
+            gap=gap,
+        )
+
+    return {
+        "arc_length": arc_length,
+        "straight_length": straight_length,
+        "round_trip_length": round_trip_length,
+        "fsr": center_wavelength ** 2 / (n_g * round_trip_length),
+        "resonance_wavelength": float(resonance_wavelength),
+        "bbox": (bbox_width, bbox_height),
+        "cost": float(result.fun),
+        "result": result,
+        "cell": cell,
+    }
@@ -0,0 +1,251 @@
+import klayout.db as db
+import numpy as np
+
+
+def _as_point_array(
+        points,
+) -> np.ndarray:
+    """Convert a list of (x, y) tuples or an (N, 2) array into an (N, 2) float array."""
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f"Expected an (N, 2) array of points, got shape {points.shape}.")
+    return points
+
+def _integer_coordinates(
+        points: np.ndarray,
+) -> np.ndarray:
+    """Convert coordinates to integers the way `db.Point(x, y)` does (truncation)."""
+    return np.trunc(points).astype(np.int64)
+
+def _integer_point_strings(
+        point_arrays: list[np.ndarray],
+) -> list[str]:
+    """Format a batch of (N, 2) integer arrays as klayout point lists "(x,y;x,y;...)".
+
+    All arrays are formatted in a single operation and later parsed by
+    klayout in C++, which avoids creating one Python object per vertex.
+    """
+    if not point_arrays:
+        return []
+    template = "|".join("(" + ";".join(["%d,%d"] * len(points)) + ")" for points in point_arrays)
+    coordinates = np.concatenate([points.reshape(-1) for points in point_arrays])
+    return (template % tuple(coordinates.tolist())).split("|")
+
+def to_dpoints(
+        points,
+) -> list[db.DPoint]:
+    """Convert an (N, 2) array of coordinates in microns into db.DPoint objects.
+
+    Args:
+        points: A list of (x, y) tuples or an (N, 2) array.
+
+    Returns:
+        A list of db.DPoint objects.
+    """
+    points = _as_point_array(points)
+    return list(map(db.DPoint, points[:, 0].tolist(), points[:, 1].tolist()))
+
+def to_dpath(
+        points,
+        width: float,
+) -> db.DPath:
+    """Convert an (N, 2) array of coordinates in microns into a db.DPath.
+
+    Args:
+        points: A list of (x, y) tuples or an (N, 2) array.
+        width: Width of the path (in microns).
+
+    Returns:
+        A db.DPath object.
+
+    Example:
+        .. code::
+
+            bend = to_dpath(circle(radius=10, angle=90), width=0.45)
+            cell.shapes(layer).insert(bend)
+    """
+    return db.DPath(_as_point_array(points).tolist(), width)
+
+def to_dpolygon(
+        points,
+        raw: bool = False,
+) -> db.DPolygon:
+    """Convert an (N, 2) array of coordinates in microns into a db.DPolygon.
+
+    Args:
+        points: A list of (x, y) tuples or an (N, 2) array of the hull.
+        raw: If True, the points are taken as they are, without removing
+            duplicate or collinear points.
+
+    Returns:
+        A db.DPolygon object.
+    """
+    return db.DPolygon(_as_point_array(points).tolist(), raw)
+
+def to_paths(
+        point_arrays: list,
+        width: int,
+) -> list[db.Path]:
+    """Convert a batch of point arrays in database units into db.Path objects.
+
+    Float coordinates are truncated to integers, like `db.Point` does.
+
+    Args:
+        point_arrays: A list of (x, y) tuple lists or (N, 2) arrays, one per
+            path spine.
+        width: Width of the paths (in database units).
+
+    Returns:
+        A list of db.Path objects.
+    """
+    point_arrays = [_integer_coordinates(_as_point_array(points)) for points in point_arrays]
+    return [
+        db.Path.from_s(f"{points} w={int(width)} bx=0 ex=0 r=false")
+        for points in _integer_point_strings(point_arrays)
+    ]
+
+def to_path(
+        points,
+        width: int,
+) -> db.Path:
+    """Convert an (N, 2) array of coordinates in database units into a db.Path.
+
+    Args:
+        points: A list of (x, y) tuples or an (N, 2) array.
+        width: Width of the path (in database units).
+
+    Returns:
+        A db.Path object.
+
+    Example:
+        .. code::
+
+            grating_element = to_path(arc_points, width=200)
+    """
+    return to_paths([points], width)[0]
+
+def to_polygons(
+        point_arrays: list,
+) -> list[db.Polygon]:
+    """Convert a batch of point arrays in database units into db.Polygon objects.
+
+    Float coordinates are truncated to integers, like `db.Point` does.
+    Duplicate and collinear points are removed like the db.Polygon
+    constructor does.
+
+    Args:
+        point_arrays: A list of (x, y) tuple lists or (N, 2) arrays, one per
+            polygon hull.
+
+    Returns:
+        A list of db.Polygon objects.
+    """
+    point_arrays = [_integer_coordinates(_as_point_array(points)) for points in point_arrays]
+    polygons = list(map(db.Polygon.from_s, _integer_point_strings(point_arrays)))
+    for polygon in polygons:
+        polygon.compress(False)
+    return polygons
+
+def to_polygon(
+        points,
+) -> db.Polygon:
+    """Convert an (N, 2) array of coordinates in database units into a db.Polygon.
+
+    Args:
+        points: A list of (x, y) tuples or an (N, 2) array of the hull.
+
+    Returns:
+        A db.Polygon object.
+
+    Example:
+        .. code::
+
+            polygon = to_polygon(np.vstack((curve_points1, curve_points2[::-1])))
+    """
+    return to_polygons([points])[0]
+
+def to_simple_polygons(
+        point_arrays: list,
+) -> list[db.SimplePolygon]:
+    """Convert a batch of point arrays in database units into db.SimplePolygon objects.
+
+    Args:
+        point_arrays: A list of (x, y) tuple lists or (N, 2) arrays, one per
+            polygon hull.
+
+    Returns:
+        A list of db.SimplePolygon objects.
+    """
+    point_arrays = [_integer_coordinates(_as_point_array(points)) for points in point_arrays]
+    polygons = list(map(db.SimplePolygon.from_s, _integer_point_strings(point_arrays)))
+    for polygon in polygons:
+        polygon.compress(False)
+    return polygons
+
+def to_simple_polygon(
+        points,
+) -> db.SimplePolygon:
+    """Convert an (N, 2) array of coordinates in database units into a db.SimplePolygon.
+
+    Args:
+        points: A list of (x, y) tuples or an (N, 2) array of the hull.
+
+    Returns:
+        A db.SimplePolygon object.
+    """
+    return to_simple_polygons([points])[0]
+
+def insert_polygons(
+        shapes: db.Shapes,
+        point_arrays: list,
+        dbu: float = None,
+) -> db.Region:
+    """Convert a batch of point arrays into polygons and insert them at once.
+
+    Args:
+        shapes: The db.Shapes container to insert into, e.g. `cell.shapes(layer)`.
+        point_arrays: A list of (N, 2) arrays, one per polygon hull.
+        dbu: If given, the points are in microns and are converted to
+            database units with this database unit. Otherwise the points are
+            in database units.
+
+    Returns:
+        The db.Region of inserted polygons.
+
+    Example:
+        .. code::
+
+            insert_polygons(cell.shapes(layer), [hull1, hull2], dbu=canvas.dbu)
+    """
+    if dbu is not None:
+        point_arrays = [np.rint(_as_point_array(points) / dbu) for points in point_arrays]
+    region = db.Region(to_polygons(point_arrays))
+    shapes.insert(region)
+    return region
+
+def insert_paths(
+        shapes: db.Shapes,
+        point_arrays: list,
+        width: float,
+        dbu: float = None,
+) -> list[db.Path]:
+    """Convert a batch of point arrays into paths and insert them.
+
+    Args:
+        shapes: The db.Shapes container to insert into, e.g. `cell.shapes(layer)`.
+        point_arrays: A list of (N, 2) arrays, one per path spine.
+        width: Width of the paths (in the same unit as the points).
+        dbu: If given, the points and width are in microns and are converted
+            to database units with this database unit. Otherwise they are in
+            database units.
+
+    Returns:
+        A list of the inserted db.Path objects.
+    """
+    if dbu is not None:
+        point_arrays = [np.rint(_as_point_array(points) / dbu) for points in point_arrays]
+        width = round(width / dbu)
+    paths = to_paths(point_arrays, width)
+    for path in paths:
+        shapes.insert(path)
+    return paths
@@ -0,0 +1,172 @@
+import os
+import time
+import concurrent.futures
+import klayout.db as db
+from .CellParameters import *
+from .GenerationDaemon import *
+
+
+def _build_device(
+        build,
+        dbu: float,
+) -> db.Layout:
+    """Generate one device in its own layout."""
+    canvas = db.Layout()
+    canvas.dbu = dbu
+    if isinstance(build, dict):
+        generate_device(canvas, build)
+    else:
+        build(canvas)
+    return canvas
+
+def _build_and_write(
+        name: str,
+        build,
+        output_dir: str,
+        file_format: str,
+        dbu: float,
+) -> tuple[str, float, float]:
+    # Runs in a worker process: generation and writing both hold the GIL, so they
+    # only overlap with the other devices when they run in separate processes
+    start_time = time.perf_counter()
+    canvas = _build_device(build, dbu)
+    generate_time = time.perf_counter() - start_time
+
+    file_path = os.path.join(output_dir, f"{name}.{file_format}")
+    canvas.write(file_path, annotation_save_options())
+    return file_path, generate_time, time.perf_counter() - start_time - generate_time
+
+def stream_build(
+        devices,
+        output_dir: str,
+        max_pending: int = None,
+        workers: int = 2,
+        file_format: str = "gds",
+        dbu: float = 0.001,
+) -> dict:
+    """Generate devices and write them to per-device files in a process pool.
+
+    Each worker process builds a device and writes its file itself, so the
+    generation of one device overlaps with the writing of others. There is
+    no separate writer stage: klayout holds the GIL while writing, so a
+    writer thread would not overlap with the generation. The devices are
+    submitted lazily, at most `max_pending` at a time, which bounds the
+    peak memory independently of the sweep size.
+
+    Args:
+        devices: Iterable of (name, build) pairs. `build` is either a device
+            specification of the generation daemon, e.g.
+            `{"generator": "all_pass_euler_ring", "params": {"layer": [1, 0]}}`,
+            or a picklable function `build(canvas)` which creates the device in
+            the given layout (a module-level function or a functools.partial,
+            not a lambda). A generator keeps large sweeps lazy.
+        output_dir: Directory for the output files, created if needed.
+        max_pending: Maximum number of submitted, unfinished devices, at
+            least `workers`. Defaults to twice the number of workers.
+        workers: Number of worker processes.
+        file_format: The file suffix, "gds" or "oas".
+        dbu: The database unit of the device layouts (in microns).
+
+    Returns:
+        A dictionary with the keys "files" (written files in completion
+        order), "generate_time" and "write_time" (accumulated seconds of each
+        stage over all workers) and "total_time" (wall time).
+
+    Raises:
+        Exception: The first error raised by a worker, after the submitted
+            devices have finished.
+
+    Example:
+        .. code::
+
+            sweep = (
+                (f"ring_{arc_length}", {"generator": "all_pass_euler_ring",
+                                        "params": {"layer": [1, 0], "arc_length": arc_length}})
+                for arc_length in range(20, 200)
+            )
+            stream_build(sweep, "src/output/sweep", workers=4)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    max_pending = 2 * workers if max_pending is None else max(max_pending, workers)
+    start_time = time.perf_counter()
+    results = {"files": [], "generate_time": 0.0, "write_time": 0.0}
+
+    def collect(done) -> None:
+        for future in done:
+            file_path, generate_time, write_time = future.result()
+            results["files"].append(file_path)
+            results["generate_time"] += generate_time
+            results["write_time"] += write_time
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for name, build in devices:
+            # Wait for a finished device while the window is full, which is the back-pressure on the sweep
+            if len(pending) >= max_pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(_build_and_write, name, build, output_dir, file_format, dbu))
+        collect(concurrent.futures.as_completed(pending))
+
+    results["total_time"] = time.perf_counter() - start_time
+    return results
+
+def phased_build(
+        devices,
+        output_dir: str,
+        file_format: str = "gds",
+        dbu: float = 0.001,
+) -> dict:
+    """Generate all devices first and write them afterwards, in this process.
+
+    This is the reference for `stream_build`, with the same arguments and
+    result keys.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start_time = time.perf_counter()
+    layouts = [(name, _build_device(build, dbu)) for name, build in devices]
+    generate_time = time.perf_counter() - start_time
+
+    files = []
+    for name, canvas in layouts:
+        file_path = os.path.join(output_dir, f"{name}.{file_format}")
+        canvas.write(file_path, annotation_save_options())
+        files.append(file_path)
+    total_time = time.perf_counter() - start_time
+
+    return {"files": files, "generate_time": generate_time, "write_time": total_time - generate_time,
+            "total_time": total_time}
+
+def compare_build_modes(
+        devices: list,
+        output_dir: str,
+        workers: int = 2,
+        file_format: str = "gds",
+        dbu: float = 0.001,
+) -> list[dict]:
+    """Measure the wall time of `stream_build` against `phased_build`.
+
+    Args:
+        devices: List of (name, build) pairs, see `stream_build`.
+        output_dir: Directory for the output files of both builds.
+        workers: Number of worker processes of the streaming build.
+        file_format: The file suffix, "gds" or "oas".
+        dbu: The database unit of the device layouts (in microns).
+
+    Returns:
+        The results of both builds, each extended by "mode" and
+        "time_saved" relative to the phased build.
+    """
+    devices = list(devices)
+    results = [
+        dict(phased_build(devices, output_dir, file_format=file_format, dbu=dbu), mode="phased"),
+        dict(stream_build(devices, output_dir, workers=workers, file_format=file_format, dbu=dbu), mode="stream"),
+    ]
+
+    reference = results[0]
+    for stats in results:
+        stats["time_saved"] = reference["total_time"] - stats["total_time"]
+        print(f"{stats['mode']:>6}: {stats['total_time']:.2f} s (generate {stats['generate_time']:.2f} s, "
+              f"write {stats['write_time']:.2f} s), saved {stats['time_saved']:.2f} s")
+
+    return results
@@ -6,4 +6,26 @@ from .AllPassEulerRing import *
 from .AllPassAdiabaticEulerRing import *
 from .GratingLidarNature import *
 from .GratingLidarAnsys import *
-from .BasicOperator import * 
\ No newline at end of file
+from .BasicOperator import * 
+from .LayoutSearch import *
+from .LayoutLoader import *
+from .ShapeConversion import *
+from .RingModel import *
+from .CurveProfile import *
+from .GratingModel import *
+from .RingOptimizer import *
+from .DieStepping import *
+from .GeometryRegression import *
+from .GenerationDaemon import *
+from .PolygonFracturing import *
+from .ColumnarExport import *
+from .StreamingBuild import *
+from .AffineTransform import *
+from .DensityAnalysis import *
+from .LayoutClip import *
+from .LayoutDiff import *
+from .LibraryReference import *
+from .LayoutStats import *
+from .LayoutPreview import *
+from .CellParameters import *
+from .DerivedLayers import *
@@ -44,4 +44,7 @@ offset = db.DVector(200, 0)
 top_cell.insert(db.DCellInstArray(all_pass_euler_ring_1.cell_index(), db.DTrans(offset)))
 
 # Write the layout to a GDS file
-canvas.write("src/output/AllPassRing1.gds")
\ No newline at end of file
+canvas.write("src/output/AllPassRing1.gds", annotation_save_options())
+
+# Report the vertices removed from the generated curves
+print_curve_cleanup()
\ No newline at end of file
@@ -20,8 +20,11 @@ def main():
             )
     
     
-    # Write the layout to a GDS file
-    layout.write("src/output/AllPassRing1.gds")
+    # Fracture polygons above the GDSII vertex limit and write the layout to a GDS file
+    write_fractured(layout, "src/output/AllPassRing1.gds")
     print("GDS file 'result.gds' written successfully.")
 
+    # Report the vertices removed from the generated curves
+    print_curve_cleanup()
+
 main()
@@ -0,0 +1,51 @@
+import time
+import klayout.db as db
+import numpy as np
+from DeviceLibrary import *
+
+# Compare the per-vertex conversion used by the generators so far with the
+# bulk helpers of ShapeConversion at 10^6+ vertices.
+num_vertices_list = [10**6, 4 * 10**6]
+num_batch_polygons = 10**4
+
+def benchmark(label, function, repeat=3):
+    """Run a function several times and print the best wall time."""
+    best_time = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start_time)
+    print(f"    {label:<40} {best_time:8.3f} s")
+    return best_time
+
+for num_vertices in num_vertices_list:
+    print(f"{num_vertices} vertices")
+    angles = np.linspace(0, 2 * np.pi, num_vertices, endpoint=False)
+    curve_points = list(zip(1e4 * np.cos(angles), 1e4 * np.sin(angles)))
+    curve_array = np.array(curve_points)
+
+    old_time = benchmark("DPath, per-vertex db.DPoint", lambda: db.DPath([db.DPoint(x, y) for x, y in curve_points], 0.45))
+    new_time = benchmark("DPath, to_dpath", lambda: to_dpath(curve_array, 0.45))
+    print(f"    speedup {old_time / new_time:.1f}x")
+
+    old_time = benchmark("Polygon, per-vertex db.Point", lambda: db.Polygon([db.Point(*pt) for pt in curve_array]))
+    new_time = benchmark("Polygon, to_polygon", lambda: to_polygon(curve_array))
+    print(f"    speedup {old_time / new_time:.1f}x")
+
+    # Batch of small polygons inserted into a cell
+    points_per_polygon = num_vertices // num_batch_polygons
+    batch = [curve_array[i * points_per_polygon:(i + 1) * points_per_polygon] * 0.01 for i in range(num_batch_polygons)]
+
+    def insert_each():
+        layout = db.Layout()
+        shapes = layout.create_cell("BATCH").shapes(layout.layer(1, 0))
+        for points in batch:
+            shapes.insert(db.Polygon([db.Point(*pt) for pt in points]))
+
+    def insert_bulk():
+        layout = db.Layout()
+        insert_polygons(layout.create_cell("BATCH").shapes(layout.layer(1, 0)), batch)
+
+    old_time = benchmark(f"{num_batch_polygons} polygons, per-vertex insert", insert_each)
+    new_time = benchmark(f"{num_batch_polygons} polygons, insert_polygons", insert_bulk)
+    print(f"    speedup {old_time / new_time:.1f}x")
@@ -0,0 +1,35 @@
+import time
+import numpy as np
+from DeviceLibrary import *
+
+# Compare the Fresnel backends with SciPy in accuracy and speed, on the
+# samples of Euler bends (0 <= z <= 1) and on a wide range of arguments.
+num_points_list = [2000, 10**5, 10**6]
+euler_constant = 25.0  # Euler constant l in microns, for the error in nm
+
+def benchmark(label, function, repeat=5):
+    """Run a function several times and print the best wall time."""
+    best_time = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start_time)
+    print(f"    {label:<40} {best_time * 1e3:10.3f} ms")
+    return best_time
+
+for z_max in (1.0, 10.0):
+    for num_points in num_points_list:
+        print(f"{num_points} samples, 0 <= z <= {z_max}")
+        z = np.linspace(0, z_max, num_points)
+        reference_sin, reference_cos = fresnel(z, backend="scipy")
+        reference_time = benchmark("scipy", lambda: fresnel(z, backend="scipy"))
+        for backend in FRESNEL_BACKENDS[1:]:
+            fresnel_sin, fresnel_cos = fresnel(z, backend=backend)
+            error = max(np.max(np.abs(fresnel_sin - reference_sin)), np.max(np.abs(fresnel_cos - reference_cos)))
+            backend_time = benchmark(backend, lambda: fresnel(z, backend=backend))
+            print(f"        max error {error:.2e} ({error * euler_constant * 1e3:.2e} nm at l = {euler_constant} um),"
+                  f" speedup {reference_time / backend_time:.1f}x")
+
+print("euler_arc180_curve, 2000 points per half")
+for backend in FRESNEL_BACKENDS:
+    benchmark(backend, lambda: euler_arc180_curve(s=25, alpha=np.pi / 625, num_points=2000, fresnel_backend=backend))
@@ -0,0 +1,27 @@
+import argparse
+import klayout.db as db
+from DeviceLibrary import *
+
+# Extract sub-regions of a large layout into small files, e.g.
+#   python src/main_clip.py src/input/chip.gds --box 0,0,500,500 --box 1000,0,1500,500 --workers 2
+parser = argparse.ArgumentParser(description="Clip boxes out of a layout file.")
+parser.add_argument("layout", help="GDS/OASIS file to clip")
+parser.add_argument("--box", action="append", required=True, help="clip box 'left,bottom,right,top' in microns, repeatable")
+parser.add_argument("--name", action="append", help="name of the clip, one per box (default clip_<i>)")
+parser.add_argument("--cell", default=None, help="cell to clip (default: the top cell)")
+parser.add_argument("--output", default="src/output/clips", help="output directory")
+parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+parser.add_argument("--format", default="gds", choices=["gds", "oas"], help="output format")
+args = parser.parse_args()
+
+boxes = []
+for box in args.box:
+    left, bottom, right, top = (float(value) for value in box.split(","))
+    boxes.append(db.DBox(left, bottom, right, top))
+
+output_paths = clip_to_files(
+    args.layout, boxes, args.output,
+    names=args.name, cell_name=args.cell, workers=args.workers, file_format=args.format,
+)
+for box, output_path in zip(boxes, output_paths):
+    print(f"{box} -> {output_path}")
@@ -0,0 +1,32 @@
+import argparse
+import json
+import sys
+from DeviceLibrary import *
+
+# Warm generation daemon and its thin client.
+#   python src/main_daemon.py serve
+#   python src/main_daemon.py submit job.json
+#   python src/main_daemon.py ping | clear_cache | shutdown
+parser = argparse.ArgumentParser(description="DeviceLibrary generation daemon.")
+parser.add_argument("command", choices=["serve", "submit", "ping", "clear_cache", "shutdown"])
+parser.add_argument("job", nargs="?", help="job JSON file for 'submit', '-' reads from stdin")
+parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="path of the Unix-domain socket")
+parser.add_argument("--max-cached-cells", type=int, default=DEFAULT_MAX_CACHED_CELLS,
+                    help="number of device layouts the daemon keeps cached")
+args = parser.parse_args()
+
+if args.command == "serve":
+    serve(socket_path=args.socket, max_cached_cells=args.max_cached_cells)
+    sys.exit(0)
+
+job = None
+if args.command == "submit":
+    if args.job is None:
+        parser.error("'submit' requires a job file")
+    with (sys.stdin if args.job == "-" else open(args.job)) as job_file:
+        job = json.load(job_file)
+
+response = submit_job(job=job, socket_path=args.socket, command="run" if args.command == "submit" else args.command)
+print(json.dumps(response, indent=2))
+if response.get("status") != "ok":
+    sys.exit(1)
@@ -0,0 +1,20 @@
+import argparse
+from DeviceLibrary import *
+
+# Add cladding and keep-out layers to a generated layout, e.g.
+#   python src/main_derive.py src/output/GratingAnsys1.gds src/output/GratingAnsys1_clad.gds \
+#       --rule "11/4 = size(10/2, 2)" --rule "20/0 = bbox(*, 5)"
+parser = argparse.ArgumentParser(description="Compute derived layers with hierarchical sizing and booleans.")
+parser.add_argument("layout", help="input layout file (GDS/OASIS)")
+parser.add_argument("output", help="output layout file")
+parser.add_argument("--rule", action="append", required=True,
+                    help='derived-layer rule such as "11/4 = size(10/2, 2)", can be repeated')
+parser.add_argument("--threads", type=int, default=4, help="threads of the deep shape store")
+args = parser.parse_args()
+
+layout, _ = load_layout(args.layout)
+for top_cell in layout.top_cells():
+    result = derive_layers(layout, top_cell, args.rule, threads=args.threads)
+    print(f"{top_cell.name}: derived layers {', '.join(result['layers'])} in {result['time']:.2f} s")
+
+layout.write(args.output, annotation_save_options())
@@ -0,0 +1,18 @@
+import argparse
+from DeviceLibrary import *
+
+# Report which cells changed between two revisions of a layout, e.g.
+#   python src/main_diff.py src/input/chip_v2.gds src/input/chip_v3.gds
+parser = argparse.ArgumentParser(description="Hierarchical cell diff between two layout revisions.")
+parser.add_argument("old_layout", help="previous revision (GDS/OASIS)")
+parser.add_argument("new_layout", help="new revision (GDS/OASIS)")
+args = parser.parse_args()
+
+# The hashes are stored next to each file, so an unchanged revision is not hashed again
+changes = diff_layouts(old_hashes=file_cell_hashes(args.old_layout), new_hashes=file_cell_hashes(args.new_layout))
+
+for key in ("added", "removed", "modified", "affected"):
+    print(f"{key} ({len(changes[key])}):")
+    for name in changes[key]:
+        print(f"    {name}")
+print(f"{len(changes['unchanged'])} unchanged subtree(s) skipped")
@@ -37,6 +37,6 @@ grating_ansys=grating_ansys_lidar(
 
 
 # Create the output layout file
-canvas.write("src/output/GratingAnsys1.gds")
+canvas.write("src/output/GratingAnsys1.gds", annotation_save_options())
 
 print("GDS file generated: centered_connected_rectangles.gds")
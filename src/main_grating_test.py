@@ -22,5 +22,8 @@ grating1=grating_nature_lidar(
 )
 
 # Write the layout to a GDS file
-canvas.write("src/output/GratingNature1.gds")
-print("GDS file 'result.gds' written successfully.")
\ No newline at end of file
+canvas.write("src/output/GratingNature1.gds", annotation_save_options())
+print("GDS file 'result.gds' written successfully.")
+
+# Report the vertices removed from the generated curves
+print_curve_cleanup()
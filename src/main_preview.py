@@ -0,0 +1,30 @@
+import argparse
+from DeviceLibrary import *
+
+# Headless thumbnails of sweep variants, e.g.
+#   python src/main_preview.py src/output/sweep.gds --cells "ALL_PASS_RING*" --layers 1/0 --sheet src/output/sweep.png
+parser = argparse.ArgumentParser(description="Render PNG thumbnails and a contact sheet of layout cells.")
+parser.add_argument("layout", help="layout file (GDS/OASIS)")
+parser.add_argument("--cells", default=None,
+                    help="glob pattern of the cells to render, default the children of the top cell")
+parser.add_argument("--layers", nargs="+", default=None,
+                    help="layers to render as layer/datatype, default all layers")
+parser.add_argument("--size", type=int, default=128, help="pixels along the longer side of a thumbnail")
+parser.add_argument("--columns", type=int, default=8, help="thumbnails per row of the contact sheet")
+parser.add_argument("--threads", type=int, default=4, help="rendering threads")
+parser.add_argument("--output-dir", default=None, help="directory for one PNG per cell")
+parser.add_argument("--sheet", default=None, help="PNG file of the contact sheet")
+args = parser.parse_args()
+
+layers = None if args.layers is None else [tuple(map(int, layer.split("/"))) for layer in args.layers]
+layout, _ = load_layout(args.layout, mode="full" if layers is None else "layers", layers=layers)
+
+if args.cells is None:
+    cells = [layout.cell(index) for index in layout.top_cell().each_child_cell()]
+else:
+    cells = sorted(match_cell_names(layout, args.cells), key=lambda cell: cell.name)
+layer_indexes = layout.layer_indexes() if layers is None else [layout.find_layer(*layer) for layer in layers]
+
+result = render_thumbnails(layout, cells, layer_indexes, output_dir=args.output_dir, sheet_path=args.sheet,
+                           size=args.size, columns=args.columns, threads=args.threads)
+print(f"Rendered {len(result['images'])} cell(s)")
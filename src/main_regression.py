@@ -0,0 +1,27 @@
+import argparse
+import os
+import sys
+from DeviceLibrary import *
+
+# Compare every device and entry-point layout against the golden GDS files.
+# Create the golden files once from a trusted revision with --update.
+parser = argparse.ArgumentParser(description="Geometric regression check of the DeviceLibrary layouts.")
+parser.add_argument("--golden", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden"),
+                    help="directory of the golden GDS files")
+parser.add_argument("--update", action="store_true", help="write the current layouts as golden files")
+parser.add_argument("--tolerance", type=float, default=0.0, help="ignored difference size in microns")
+parser.add_argument("--threads", type=int, default=os.cpu_count(), help="number of XOR threads")
+parser.add_argument("--tile-size", type=float, default=200.0, help="XOR tile size in microns")
+args = parser.parse_args()
+
+failures = run_regression(
+    golden_dir=args.golden,
+    update=args.update,
+    tolerance=args.tolerance,
+    threads=args.threads,
+    tile_size=args.tile_size,
+)
+
+if failures:
+    print(f"{len(failures)} regression case(s) failed.")
+    sys.exit(1)
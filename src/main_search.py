@@ -1,58 +1,43 @@
 import klayout.db as db
+from DeviceLibrary import *
 
 # Load your GDS file
-layout = db.Layout()
 gds_file_path = "C:/Users/32232/Documents/OEDS/OEDS/src/input/Full_layout_0720_V3.gds"
+
+# "hierarchy" reads cells and instances only, which is enough to find placements.
+# Use "layers" with e.g. load_layers = [(1, 0)] to also get the device sizes.
+load_mode = "hierarchy"
+load_layers = None
 try:
-    layout.read(gds_file_path)  # Replace with your GDS file path
+    layout, load_stats = load_layout(gds_file_path, mode=load_mode, layers=load_layers)
     print(f"Successfully loaded GDS file: {gds_file_path}")
 except Exception as e:
     print(f"Error loading GDS file: {e}")
     exit(1)
 
-# Define the device name you're searching for
+# Define the device name you're searching for (glob patterns such as "BP_M1M2_*" are supported)
 device_name = "BP_M1M2_80_60"  # Replace with the actual device name
-device_found = False  # Flag to track if the device is found
-
-def search_instances(cell):
-    """Recursive function to search through all instances of a given cell."""
-    global device_found
-    for inst in cell.each_inst():
-        cell_name = inst.cell.name
-        print(f"Checking instance in cell '{cell.name}': {cell_name}")
-
-        if cell_name == device_name:
-            device_found = True
-            # Get the bounding box of the instance
-            bbox = inst.bbox()
-
-            # Calculate position and size
-            x_min = bbox.left
-            y_min = bbox.bottom
-            x_max = bbox.right
-            y_max = bbox.top
-
-            width = x_max - x_min
-            height = y_max - y_min
-
-            # Get the transformation (position) of the instance
-            transformation = inst.trans
-
-            print(f"Device '{device_name}' found at position: ({transformation.disp.x}, {transformation.disp.y})")
-            print(f"Size: {width} x {height}")
-            return  # Exit the search once the device is found
-
-        # Recursively search in the instance's cell (subcells)
-        search_instances(inst.cell)
 
 # Start searching from the top cell
 top_cell = layout.top_cell()
 if top_cell:
     print(f"Top cell found: {top_cell.name}")
-    search_instances(top_cell)
 else:
     print("No top cell found in the layout. Exiting.")
     exit(1)
 
-if not device_found:
+# Build the parent index once and collect every placement of the device
+parent_index = build_parent_index(layout)
+placements = find_cell_placements(layout, device_name, top_cell=top_cell, parent_index=parent_index)
+
+for placement in placements:
+    bbox = placement["bbox"]
+    disp = placement["trans"].disp
+    print(f"Device '{placement['cell']}' found at position: ({disp.x}, {disp.y})")
+    if not bbox.empty():
+        print(f"Size: {bbox.width()} x {bbox.height()}")
+
+if not placements:
     print(f"Device '{device_name}' not found in the layout.")
+else:
+    print(f"Found {len(placements)} placement(s) of '{device_name}'.")
@@ -0,0 +1,30 @@
+import argparse
+import os
+from DeviceLibrary import *
+
+# Profile an input layout before working with it, e.g.
+#   python src/main_stats.py src/input/chip.gds --layers 1/0 2/0 --workers 2 --json src/output/chip_stats.json
+parser = argparse.ArgumentParser(description="Shape, vertex and hierarchy statistics of a layout file.")
+parser.add_argument("layout", help="layout file (GDS/OASIS)")
+parser.add_argument("--layers", nargs="+", required=True,
+                    help="layers to count as layer/datatype, split into one group per worker")
+parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                    help="worker processes, one group of layers each, default the number of CPUs")
+parser.add_argument("--json", default=None, help="write the full report as JSON")
+parser.add_argument("--csv", default=None, help="write the per cell and layer counts as CSV")
+args = parser.parse_args()
+
+layers = [tuple(map(int, layer.split("/"))) for layer in args.layers]
+stats = layout_stats(args.layout, layers=layers, workers=args.workers)
+
+totals = stats["totals"]
+print(f"Top cells: {', '.join(stats['top_cells'])}, {totals['cells']} cells, depth {stats['depth']}")
+print(f"{'layer':>10} {'shapes':>12} {'vertices':>14} {'flat shapes':>14} {'flat vertices':>16}")
+for layer_name, counts in list(stats["layers"].items()) + [("total", totals)]:
+    print(f"{layer_name:>10} {counts['shapes']:>12} {counts['vertices']:>14} "
+          f"{counts['flat_shapes']:>14} {counts['flat_vertices']:>16}")
+
+if args.json:
+    write_stats_json(stats, args.json)
+if args.csv:
+    write_stats_csv(stats, args.csv)